@@ -0,0 +1,271 @@
+# Load, save, countdown tick, sort and reorder timings on synthetic tabs of 100 to 100k entries.
+# The core operations run without Qt. If PySide2 is installed, the same tabs are also opened in a real
+# ScheduleApp on Qt's offscreen platform. Every result has the best and median time over --repeat runs
+# and the peak memory of one extra run traced with tracemalloc. Results are written as json, so two
+# versions can be compared run by run.
+#
+#   python benchmarks/run_benchmarks.py --sizes 100,1000,10000,100000 --output results.json
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core import EntryStore, SortIndex, TabSchema, countdown_text, format_date_time
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+LAYOUTS = ["watch", "plain"]
+VISIBLE_ROWS = 60  # about one screen of the table
+EDITS_PER_SAVE = 100
+MOVED_ROWS = 10
+WORDS = ["Frieren", "Dungeon", "Meshi", "Spy", "Family", "Blue", "Lock", "Solo", "Leveling", "Oshi", "no", "Ko",
+         "Kaiju", "No. 8", "Dandadan", "Season", "Part", "Movie"]
+
+
+def synthetic_entries(count, layout, seed=0):
+    # Entries as a tab file stores them. Some are undated or completed; alarms are only set on future
+    # dates so opening a tab doesn't ring anything.
+    rng = random.Random(seed)
+    now = datetime.now().replace(second=0, microsecond=0)
+    entries = {}
+    for position in range(count):
+        if rng.random() < 0.05:
+            date_time = "N/A"
+            future = False
+        else:
+            when = now + timedelta(minutes=rng.randint(-60 * 24 * 30, 60 * 24 * 90))
+            date_time = format_date_time(when)
+            future = when > now
+        entry = {"name": " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) + f" {position}",
+                 "datetime": date_time, "status": rng.random() < 0.3, "alarm": future and rng.random() < 0.5,
+                 "snooze": False, "entry_position": position}
+        if layout == "watch":
+            entry["episode"] = f"S{rng.randint(1, 4):02d} E-{rng.randint(1, 24):02d}"
+        entries[str(position)] = entry
+    return entries
+
+
+def write_tab(directory, layout, count):
+    filename = os.path.join(directory, f"{layout}_{count}.json")
+    with open(filename, "w") as file:
+        json.dump(synthetic_entries(count, layout), file)
+    return filename
+
+
+def measure(run, setup=None, repeat=5):
+    # setup() builds the state run(state) needs and is not timed
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        started = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - started)
+    state = setup() if setup is not None else None
+    tracemalloc.start()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    times.sort()
+    return {"best_ms": round(1000 * times[0], 3), "median_ms": round(1000 * times[len(times) // 2], 3),
+            "peak_kib": round(peak / 1024, 1)}
+
+
+def scratch_copy(filename):
+    # A throwaway copy of the tab for operations that write, so the original stays the same for every run
+    scratch = filename[:-len(".json")] + "_scratch.json"
+    for leftover in (scratch + EntryStore.JOURNAL_SUFFIX, scratch + EntryStore.COMPACTING_SUFFIX):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    shutil.copyfile(filename, scratch)
+    return scratch
+
+
+def core_benchmarks(filename, repeat):
+    # operation -> measure(...) for the Qt-free store, sort index and countdown code
+    store = EntryStore(filename)
+    count = len(store)
+    now = datetime.now()
+    middle = count // 2
+
+    def edited_store():
+        edited = EntryStore(scratch_copy(filename))
+        for row in range(min(EDITS_PER_SAVE, count)):
+            edited.set_field(edited.order[row], "name", f"edited {row}")
+        return edited
+
+    def warm_index():
+        index = SortIndex(store)
+        index.ordered(store.order, [("countdown", False), ("name", False)])
+        return index
+
+    def visible_countdowns(state):
+        for key in store.order[middle:middle + VISIBLE_ROWS]:
+            countdown_text(store.entries[key], store.timestamp(key), now)
+
+    def all_countdowns(state):
+        for key in store.order:
+            countdown_text(store.entries[key], store.timestamp(key), now)
+
+    def fresh_store():
+        # Reorders aren't saved, but each one adds a change record; a new store per run keeps that list short
+        return EntryStore(filename)
+
+    block = list(range(middle, min(middle + MOVED_ROWS, count)))
+    return {
+        "load": measure(lambda state: EntryStore(filename), repeat=repeat),
+        "save_snapshot": measure(lambda state: state.write_snapshot(state.copy_entries()),
+                                 lambda: EntryStore(scratch_copy(filename)), repeat),
+        f"save_journal_{EDITS_PER_SAVE}_edits": measure(lambda state: state.save(), edited_store, repeat),
+        f"tick_visible_{VISIBLE_ROWS}_rows": measure(visible_countdowns, repeat=repeat),
+        "tick_all_rows": measure(all_countdowns, repeat=repeat),
+        "sort_cold": measure(lambda state: SortIndex(store).ordered(store.order, [("datetime", False)]),
+                             repeat=repeat),
+        "sort_warm_two_keys": measure(lambda state: state.ordered(store.order, [("countdown", False), ("name", False)]),
+                                      warm_index, repeat),
+        "reorder_row_up": measure(lambda state: state.move(middle, middle - 1) if middle else None, fresh_store,
+                                  repeat),
+        f"reorder_{MOVED_ROWS}_rows_to_end": measure(lambda state: state.move_rows(block, count), fresh_store,
+                                                      repeat),
+    }
+
+
+def gui_benchmarks(app, main, filename, layout, repeat):
+    # The same operations through a real ScheduleApp on the offscreen platform
+    scheduler = main.SaveScheduler()
+    clock = main.AppClock()
+    schema = TabSchema(layout)
+    tabs = []
+
+    def close_tabs():
+        # Only one tab alive at a time, or 100k-entry runs would keep every copy in memory
+        for tab in tabs:
+            clock.unsubscribe(tab.update_countdown)
+            scheduler.discard(tab)
+            tab.close()
+            tab.deleteLater()
+        tabs.clear()
+        app.processEvents()
+
+    def open_tab(state, tab_filename=filename):
+        tab = main.ScheduleApp(tab_filename, scheduler, main.JsonStorage(), EntryStore(tab_filename), clock=clock,
+                               schema=schema)
+        tab.resize(1200, 800)
+        tab.show()
+        app.processEvents()  # first paint
+        tabs.append(tab)
+        return tab
+
+    def shown_tab():
+        close_tabs()
+        return open_tab(None)
+
+    def sort_mode_tab():
+        tab = shown_tab()
+        tab.toggle_sort()
+        return tab
+
+    def edited_tab():
+        close_tabs()
+        tab = open_tab(None, scratch_copy(filename))
+        for row in range(min(EDITS_PER_SAVE, tab.model.rowCount())):
+            tab.model.set_fields(row, {"name": f"edited {row}"})
+        return tab
+
+    def tick(tab):
+        tab.update_countdown()
+        app.processEvents()
+
+    def sort(tab):
+        tab.on_header_clicked(schema.index["datetime"])
+        app.processEvents()
+
+    def reorder(tab):
+        count = tab.model.rowCount()
+        tab.model.move_rows(list(range(count // 2, min(count // 2 + MOVED_ROWS, count))), count)
+        app.processEvents()
+
+    def save(tab):
+        tab.save_data()
+        scheduler.flush(wait=True)
+
+    results = {
+        "gui_open_and_paint": measure(open_tab, close_tabs, repeat),
+        "gui_tick": measure(tick, shown_tab, repeat),
+        "gui_sort_datetime": measure(sort, sort_mode_tab, repeat),
+        f"gui_reorder_{MOVED_ROWS}_rows_to_end": measure(reorder, shown_tab, repeat),
+        f"gui_save_{EDITS_PER_SAVE}_edits": measure(save, edited_tab, repeat),
+    }
+    close_tabs()
+    return results
+
+
+def load_gui():
+    # (QApplication, main module), or (None, reason) when PySide2 isn't available
+    try:
+        from PySide2.QtWidgets import QApplication
+    except ImportError as e:
+        return None, str(e)
+    app = QApplication.instance() or QApplication([])
+    import main
+    return app, main
+
+
+def main_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description="Time load, save, tick, sort and reorder on synthetic tabs.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated entry counts (default %(default)s)")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS), help="watch, plain or both (default %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per operation (default %(default)s)")
+    parser.add_argument("--no-gui", action="store_true", help="only the Qt-free core benchmarks")
+    parser.add_argument("--output", help="write the json results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    layouts = [layout.strip() for layout in args.layouts.split(",")]
+    app, main = (None, "disabled with --no-gui") if args.no_gui else load_gui()
+    results = {
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qt_platform": os.environ.get("QT_QPA_PLATFORM"),
+        "repeat": args.repeat,
+        "gui": app is not None,
+        "gui_skipped": None if app is not None else main,
+        "runs": [],
+    }
+    directory = tempfile.mkdtemp(prefix="schedule_bench_")
+    try:
+        for layout in layouts:
+            for size in sizes:
+                filename = write_tab(directory, layout, size)
+                operations = core_benchmarks(filename, args.repeat)
+                if app is not None:
+                    operations.update(gui_benchmarks(app, main, filename, layout, args.repeat))
+                results["runs"].append({"layout": layout, "entries": size, "file_kib": round(
+                    os.path.getsize(filename) / 1024, 1), "operations": operations})
+                print(f"{layout:>5} {size:>7} entries: " + ", ".join(
+                    f"{name} {result['best_ms']} ms" for name, result in operations.items()), file=sys.stderr)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,11 @@
+# Schedule data, alarms and Nyaa search without Qt. main.py is the Qt front end over this package;
+# everything here can be imported, profiled and load-tested headlessly.
+from .entries import (DATE_TIME_FORMAT, WATCH_TAB_WORDS, EntryStore, SqliteEntryStore, TabSchema, countdown_text,
+                      format_date_time, parse_date_time)
+from .repository import CONFIG_FILE, SQLITE_FILE, STORAGE_BACKEND, JsonStorage, SqliteStorage, open_storage
+from .scheduling import DeadlineHeap, SortIndex, next_week_changes
+from .search import NameIndex, name_words
+from .transfer import check_import_file, export_entries, file_format, iter_import_entries
+from .nyaa import (NYAA_BASE_URL, NYAA_TIMEOUT, NYAA_TOP_RESULTS, DownloadCancelled, HttpClient, NyaaClient, RssCache,
+                   TopResults, close_http_client, get_http_client, get_rss_cache, iter_nyaa_items, nyaa_query,
+                   stream_download, torrent_path)
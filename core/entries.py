@@ -0,0 +1,402 @@
+import os
+import json
+from datetime import datetime
+from functools import partial
+
+DATE_TIME_FORMAT = "%d %b %Y %H:%M"
+
+# Persistence: append edits to a per-tab journal and fold it into the tab file once it passes this size
+USE_JOURNAL = True
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+# Tabs saved before schemas existed are typed once from their filename
+WATCH_TAB_WORDS = ['anime', 'animes', 'movie', 'movies', 'tv', 'series', 'shows', 'show', 'seasons', ]
+
+
+def parse_date_time(date_time_str):
+    # None for "N/A", "Invalid Date" and anything else that isn't a date
+    try:
+        return datetime.strptime(date_time_str, DATE_TIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def format_date_time(date_time):
+    return date_time.strftime(DATE_TIME_FORMAT)
+
+
+def countdown_text(entry, date_time, now):
+    # What the Countdown column shows; date_time is the entry's pre-parsed date (None if it has none)
+    if date_time is None:
+        return "N/A" if entry.get("datetime") == "N/A" else "Invalid Date"
+    if entry["status"]:
+        return "Completed"
+    remaining = date_time - now
+    if remaining.total_seconds() > 0:
+        return f"{remaining.days} d : {remaining.seconds // 3600:02d} h : {(remaining.seconds % 3600) // 60:02d} m"
+    return "Overtime"
+
+
+class EntryStore:
+    # In-memory copy of a tab file; loaded once, every read is served from here and disk is only written.
+    # In journal mode each edit is appended to <tab>.journal as a small change record and the journal is
+    # compacted back into the tab file (the snapshot) by the writer thread once it grows past a threshold.
+    JOURNAL_SUFFIX = ".journal"
+    COMPACTING_SUFFIX = ".journal.compacting"
+
+    def __init__(self, filename, use_journal=USE_JOURNAL, read_only=False):
+        self.filename = filename
+        self.read_only = read_only  # load only: an interrupted compaction is replayed but not finished
+        self.journal_filename = filename + self.JOURNAL_SUFFIX
+        self.compacting_filename = filename + self.COMPACTING_SUFFIX
+        self.use_journal = use_journal
+        self.entries = {}  # key -> entry dict (same shape as the json file)
+        self.order = []  # keys in entry_position order, index == table row
+        self.next_key = 0
+        self.timestamps = {}  # key -> parsed datetime (None if no valid date); re-parsed only when the date changes
+        self.pending = []  # change records not yet written
+        self.watchers = []  # called with every change record as it is made (e.g. the search index)
+        self.journal_bytes = 0
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.filename, "r") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            data = {}
+
+        self.entries = data
+        self.order = [key for key, _ in sorted(data.items(), key=lambda x: x[1]["entry_position"])]
+        self.next_key = max(map(int, data.keys())) + 1 if data else 0
+
+        # Replay journals on top of the snapshot; a leftover .compacting file means the app stopped mid-compaction
+        interrupted = self.replay(self.compacting_filename)
+        self.replay(self.journal_filename)
+        self.reindex()
+        self.rebuild_timestamps()
+        self.pending = []
+        if interrupted and not self.read_only:
+            self.compact()
+        elif os.path.exists(self.journal_filename):
+            self.journal_bytes = os.path.getsize(self.journal_filename)
+
+    def replay(self, journal_filename):
+        try:
+            with open(journal_filename, "r") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash
+                    self.apply(record)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def apply(self, record):
+        op = record["op"]
+        key = record["key"]
+        if op == "set":
+            if key in self.entries:
+                self.entries[key][record["field"]] = record["value"]
+        elif op == "insert":
+            if key not in self.entries:
+                self.order.append(key)
+            self.entries[key] = record["entry"]
+            self.next_key = max(self.next_key, int(key) + 1)
+        elif op == "delete":
+            if key in self.entries:
+                self.order.remove(key)
+                del self.entries[key]
+        elif op == "move":
+            if key in self.entries:
+                self.order.remove(key)
+                self.order.insert(record["row"], key)
+        elif op == "delete_rows":
+            deleted = set(record["keys"])
+            self.order = [key for key in self.order if key not in deleted]
+            for key in deleted:
+                self.entries.pop(key, None)
+        elif op == "move_rows":
+            keys = [key for key in record["keys"] if key in self.entries]
+            moving = set(keys)
+            self.order = [key for key in self.order if key not in moving]
+            self.order[record["row"]:record["row"]] = keys
+
+    def rebuild_timestamps(self):
+        self.timestamps = {key: parse_date_time(entry.get("datetime", "N/A")) for key, entry in self.entries.items()}
+
+    def refresh_timestamp(self, key):
+        self.timestamps[key] = parse_date_time(self.entries[key].get("datetime", "N/A"))
+
+    def timestamp(self, key):
+        return self.timestamps.get(key)
+
+    def record(self, op, key, **fields):
+        record = {"op": op, "key": key, **fields}
+        self.pending.append(record)
+        for watcher in self.watchers:
+            watcher(record)
+
+    def __len__(self):
+        return len(self.order)
+
+    def reindex(self, start=0, stop=None):
+        # Keep entry_position equal to the row index for rows start..stop
+        stop = len(self.order) if stop is None else stop
+        for row in range(start, stop):
+            self.entries[self.order[row]]["entry_position"] = row
+
+    def rows(self):
+        for key in self.order:
+            yield self.entries[key]
+
+    def key_for_row(self, row):
+        if 0 <= row < len(self.order):
+            return self.order[row]
+        return None
+
+    def entry_for_row(self, row):
+        key = self.key_for_row(row)
+        return self.entries[key] if key is not None else None
+
+    def new_key(self):
+        key = str(self.next_key)
+        self.next_key += 1
+        return key
+
+    def insert(self, entry):
+        key = self.new_key()
+        entry["entry_position"] = len(self.order)
+        self.entries[key] = entry
+        self.order.append(key)
+        self.refresh_timestamp(key)
+        self.record("insert", key, entry=dict(entry))
+        return key
+
+    def set_field(self, key, field, value):
+        current = self.entries[key]
+        if current.get(field) != value:
+            current[field] = value
+            if field == "datetime":
+                self.refresh_timestamp(key)
+            self.record("set", key, field=field, value=value)
+
+    def set_row(self, row, entry):
+        # Update the entry at `row`, recording only the fields that changed
+        key = self.key_for_row(row)
+        if key is None:
+            return self.insert(entry)
+        for field, value in entry.items():
+            if field != "entry_position":
+                self.set_field(key, field, value)
+        return key
+
+    def delete(self, row):
+        key = self.key_for_row(row)
+        if key is not None:
+            del self.order[row]
+            del self.entries[key]
+            self.timestamps.pop(key, None)
+            self.reindex(row)
+            self.record("delete", key)
+        return key
+
+    def delete_rows(self, rows):
+        # Delete many rows in one pass and one change record; returns the deleted keys
+        rows = sorted(set(row for row in rows if 0 <= row < len(self.order)))
+        if not rows:
+            return []
+        keys = [self.order[row] for row in rows]
+        deleted = set(keys)
+        self.order[rows[0]:] = [key for key in self.order[rows[0]:] if key not in deleted]
+        for key in keys:
+            del self.entries[key]
+            self.timestamps.pop(key, None)
+        self.reindex(rows[0])
+        self.record("delete_rows", keys[0], keys=keys, start=rows[0])
+        return keys
+
+    def move(self, row_from, row_to):
+        key = self.order.pop(row_from)
+        self.order.insert(row_to, key)
+        self.reindex(min(row_from, row_to), max(row_from, row_to) + 1)
+        self.record("move", key, row=row_to)
+
+    def move_rows(self, rows, row_to):
+        # Move the rows as one block, keeping their order, so it lands before row_to (a row index
+        # from before the move; len(self) for the end). Only the span between source and target is
+        # touched. Returns the block's new first row.
+        rows = sorted(set(rows))
+        keys = [self.order[row] for row in rows]
+        moving = set(keys)
+        start = min(rows[0], row_to)
+        stop = max(rows[-1] + 1, row_to)
+        rest = [key for key in self.order[start:stop] if key not in moving]
+        insert_at = row_to - start - sum(1 for row in rows if row < row_to)
+        self.order[start:stop] = rest[:insert_at] + keys + rest[insert_at:]
+        self.reindex(start, stop)
+        self.record("move_rows", keys[0], keys=keys, row=start + insert_at, start=start, stop=stop)
+        return start + insert_at
+
+    def copy_entries(self):
+        return {key: dict(entry) for key, entry in self.entries.items()}
+
+    def prepare_save(self):
+        # Runs on the GUI thread: takes the pending edits and returns a job that writes them, or None.
+        # The job only touches files and its own copies, so it can run on the writer thread.
+        if not self.use_journal:
+            self.pending = []
+            return partial(self.write_snapshot, self.copy_entries())
+        if not self.pending:
+            return None
+
+        lines = "".join(json.dumps(record) + "\n" for record in self.pending)
+        self.pending = []
+        self.journal_bytes += len(lines)
+        snapshot = None
+        if self.journal_bytes > JOURNAL_COMPACT_BYTES:
+            snapshot = self.copy_entries()
+            self.journal_bytes = 0
+        return partial(self.write_journal, lines, snapshot)
+
+    def save(self):
+        job = self.prepare_save()
+        if job is not None:
+            job()
+
+    def write_journal(self, lines, snapshot=None):
+        try:
+            with open(self.journal_filename, "a") as file:
+                file.write(lines)
+        except IOError as e:
+            return
+            #print(f"Error saving data: {e}")
+        if snapshot is not None:
+            self.compact_files(snapshot)
+
+    def compact(self):
+        self.compact_files(self.copy_entries())
+        self.journal_bytes = 0
+
+    def compact_files(self, snapshot):
+        # Rotate the journal, fold it into the snapshot, then drop the rotated journal
+        try:
+            if os.path.exists(self.journal_filename):
+                os.replace(self.journal_filename, self.compacting_filename)
+        except OSError:
+            return
+        if self.write_snapshot(snapshot):
+            try:
+                os.remove(self.compacting_filename)
+            except OSError:
+                pass
+
+    def write_snapshot(self, data):
+        # Write to a temp file first so a crash mid-write can't truncate the tab file
+        temp_filename = self.filename + ".tmp"
+        try:
+            with open(temp_filename, "w") as file:
+                json.dump(data, file)
+            os.replace(temp_filename, self.filename)
+        except IOError as e:
+            return False
+            #print(f"Error saving data: {e}")
+        return True
+
+    def delete_files(self):
+        for filename in (self.filename, self.journal_filename, self.compacting_filename):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+
+class SqliteEntryStore(EntryStore):
+    # Same in-memory store, but loaded from and written to the shared SQLite database.
+    # Change records become single-row statements applied in one transaction per flush.
+    def __init__(self, storage, filename):
+        self.storage = storage
+        super().__init__(filename, use_journal=False)
+
+    def load(self):
+        self.entries = self.storage.fetch_entries(self.filename)
+        self.order = [key for key, _ in sorted(self.entries.items(), key=lambda x: x[1]["entry_position"])]
+        self.next_key = max(map(int, self.entries.keys())) + 1 if self.entries else 0
+        self.rebuild_timestamps()
+        self.pending = []
+
+    def prepare_save(self):
+        if not self.pending:
+            return None
+        records = self.pending
+        self.pending = []
+        return partial(self.storage.apply, self.filename, records)
+
+    def compact(self):
+        pass
+
+    def delete_files(self):
+        self.storage.delete_entries(self.filename)
+
+
+class TabSchema:
+    # A tab's column layout, built once per tab and saved with it in the tab config.
+    # "watch" tabs track episodes (+1 Week); extra_columns are user-defined text columns.
+    WATCH_COLUMNS = ["name", "episode", "datetime", "countdown", "status", "alarm", "snooze", "next"]
+    PLAIN_COLUMNS = ["name", "datetime", "countdown", "status", "alarm", "snooze"]
+    HEADERS = {"name": "Name", "episode": "Episode", "datetime": "Date and Time", "countdown": "Countdown",
+               "status": "Status", "alarm": "Alarm", "snooze": "Snooze", "next": "Add A Week"}
+
+    def __init__(self, kind="plain", extra_columns=()):
+        self.kind = kind
+        self.watch = kind == "watch"
+        self.extra_columns = []
+        self.columns = list(self.WATCH_COLUMNS if self.watch else self.PLAIN_COLUMNS)
+        self.index = {column: position for position, column in enumerate(self.columns)}
+        for column in extra_columns:
+            # saved columns only skip exact clashes, so tabs saved before the stricter name check keep theirs
+            if column and column not in self.index and column not in self.WATCH_COLUMNS \
+                    and column != "entry_position":
+                self.append_column(column)
+
+    @classmethod
+    def for_filename(cls, filename):
+        filename_lower = filename.lower()
+        return cls("watch" if any(word in filename_lower for word in WATCH_TAB_WORDS) else "plain")
+
+    @classmethod
+    def from_dict(cls, data, filename):
+        if not isinstance(data, dict):
+            return cls.for_filename(filename)
+        return cls(data.get("kind", "plain"), data.get("extra_columns", ()))
+
+    def to_dict(self):
+        return {"kind": self.kind, "extra_columns": list(self.extra_columns)}
+
+    def column_problem(self, column):
+        # Why `column` can't be added, or None: no empty names and nothing that clashes with a built-in field
+        if not column:
+            return "The column name is empty."
+        name = column.casefold()
+        if any(name in (existing.casefold(), self.header(existing).casefold()) for existing in self.columns):
+            return f"A column named '{column}' already exists."
+        if any(name in (field, self.header(field).casefold()) for field in self.WATCH_COLUMNS + ["entry_position"]):
+            return f"'{column}' is reserved for a built-in field."
+        return None
+
+    def can_add_column(self, column):
+        return self.column_problem(column) is None
+
+    def add_column(self, column):
+        if not self.can_add_column(column):
+            return False
+        self.append_column(column)
+        return True
+
+    def append_column(self, column):
+        self.extra_columns.append(column)
+        self.index[column] = len(self.columns)
+        self.columns.append(column)
+
+    def header(self, column):
+        return self.HEADERS.get(column, column)
@@ -0,0 +1,413 @@
+# Nyaa RSS search and torrent download without any GUI: one pooled HTTP session, a disk cache of feeds
+# and an incremental parser. Everything here blocks; the Qt layer runs it on worker threads.
+# requests and xml.etree are imported where they are used, so importing this module stays cheap.
+import os
+import re
+import json
+import heapq
+import hashlib
+import threading
+import time
+
+# Point NYAA_BASE_URL at a local server with canned RSS to test without the network
+NYAA_BASE_URL = os.environ.get("NYAA_BASE_URL", "https://nyaa.si")
+NYAA_TIMEOUT = float(os.environ.get("NYAA_TIMEOUT", "15"))  # seconds, connect and read
+NYAA_NAMESPACE = {'nyaa': 'https://nyaa.si/xmlns/nyaa'}
+NYAA_TOP_RESULTS = 100  # best-seeded results kept per search
+NYAA_CHUNK_BYTES = 16 * 1024  # the feed is parsed as it arrives, in chunks of this size
+NYAA_BATCH_ITEMS = 15  # results are handed on in batches of this many...
+NYAA_BATCH_MS = 100  # ...or whatever has arrived after this long
+# One HTTP session for searches and downloads: kept-alive connections, a few per host, retried with backoff
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))  # seconds
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "30"))  # seconds
+HTTP_POOL_HOSTS = 4
+HTTP_POOL_PER_HOST = 4
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "3"))
+HTTP_BACKOFF = 0.5  # seconds, doubled on each retry
+TORRENT_DIR = "Torrent"
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+RSS_CACHE_DIR = os.path.join("Data", "rss_cache")
+RSS_CACHE_TTL = int(os.environ.get("RSS_CACHE_TTL", 10 * 60))  # seconds a result is used without asking again
+RSS_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+
+def nyaa_query(input_text, episode_no, poster=""):
+    # Search text for the popup's two buttons; None if the episode can't be turned into a search
+    if poster == "subsplease":
+        if "S01" in episode_no:
+            search_episode = episode_no.replace("S01", "").replace("E", " ")
+        elif not "S01" in episode_no:
+            search_episode = episode_no.replace("S0", "S").replace("E", " ")
+        else:
+            return None
+        return f'{input_text} 1080p {search_episode} subsplease'
+    return f'{input_text} 1080p'
+
+
+def iter_nyaa_items(chunks):
+    # Incremental parse of an RSS feed fed in chunks: yields (title, link, seeders, size) as soon as each
+    # <item> closes, then frees it. Items with a missing or empty field are skipped. Raises ET.ParseError
+    # on a broken feed.
+    import xml.etree.ElementTree as ET
+    parser = ET.XMLPullParser(events=("end",))
+
+    def closed_items():
+        for event, element in parser.read_events():
+            if element.tag == "item":
+                try:
+                    item = (element.find('title').text, element.find('link').text,
+                            int(element.find('nyaa:seeders', NYAA_NAMESPACE).text),
+                            element.find('nyaa:size', NYAA_NAMESPACE).text)
+                except (AttributeError, TypeError, ValueError):
+                    item = None  # no title, or an empty/non-numeric seeders tag
+                element.clear()
+                if item is not None and None not in item:
+                    yield item
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from closed_items()
+    parser.close()
+    yield from closed_items()
+
+
+class TopResults:
+    # The `limit` best-seeded items seen so far, kept in a bounded min-heap. Ties go to the earlier item,
+    # the same order a stable sort of the whole feed would give.
+    def __init__(self, limit=NYAA_TOP_RESULTS):
+        self.limit = limit
+        self.heap = []  # (seeders, -arrival, item); the weakest kept item is heap[0]
+        self.seen = 0
+
+    def add(self, item):
+        # True if the item is (for now) among the best `limit`
+        entry = (item[2], -self.seen, item)
+        self.seen += 1
+        if len(self.heap) < self.limit:
+            heapq.heappush(self.heap, entry)
+            return True
+        if entry[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, entry)
+            return True
+        return False
+
+    def ordered(self):
+        return [entry[2] for entry in sorted(self.heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+class HttpClient:
+    # Shared requests.Session. The adapter keeps up to HTTP_POOL_PER_HOST warm connections per host and retries
+    # connection errors and 429/5xx answers with exponential backoff. Thread safe, so the search workers use it too.
+    def __init__(self, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), retries=HTTP_RETRIES, backoff=HTTP_BACKOFF,
+                 pool_hosts=HTTP_POOL_HOSTS, pool_per_host=HTTP_POOL_PER_HOST):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        self.timeout = timeout
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(["GET", "HEAD"]), respect_retry_after_header=True,
+                      raise_on_status=False)
+        self.adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_per_host, max_retries=retry,
+                                   pool_block=True)
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def get(self, url, timeout=None, **kwargs):
+        import requests
+        start = time.perf_counter()
+        try:
+            return self.session.get(url, timeout=timeout or self.timeout, **kwargs)
+        except requests.RequestException:
+            with self.lock:
+                self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.requests += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+
+    def connection_counts(self):
+        # (requests sent, connections opened) over every host pool urllib3 still holds
+        sent = opened = 0
+        pools = self.adapter.poolmanager.pools
+        for pool_key in list(pools.keys()):
+            pool = pools.get(pool_key)
+            if pool is not None:
+                sent += pool.num_requests
+                opened += pool.num_connections
+        return sent, opened
+
+    def stats(self):
+        sent, opened = self.connection_counts()
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "connections_opened": opened,
+                "connections_reused": max(sent - opened, 0),
+                "avg_ms": round(1000 * self.total_seconds / self.requests, 1) if self.requests else 0.0,
+                "max_ms": round(1000 * self.max_seconds, 1),
+            }
+
+    def close(self):
+        self.session.close()
+
+
+shared_http_client = None
+
+
+def get_http_client():
+    # One session (and connection pool) for the whole app
+    global shared_http_client
+    if shared_http_client is None:
+        shared_http_client = HttpClient()
+    return shared_http_client
+
+
+def close_http_client():
+    global shared_http_client
+    if shared_http_client is not None:
+        shared_http_client.close()
+        shared_http_client = None
+
+
+class RssCache:
+    # RSS responses on disk under Data/rss_cache, keyed by normalized query: one file per body plus
+    # index.json with validators, expiry and last use. Entries past their TTL are revalidated with
+    # ETag/Last-Modified; the least recently used go once the bodies pass max_bytes.
+    # Used from the search workers, so everything goes through the lock.
+    def __init__(self, directory=RSS_CACHE_DIR, ttl=RSS_CACHE_TTL, max_bytes=RSS_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.index_filename = os.path.join(directory, "index.json")
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "revalidated": 0, "misses": 0, "evictions": 0}
+        self.index = self.load_index()  # key -> {"file", "size", "etag", "last_modified", "expires", "last_used"}
+
+    @staticmethod
+    def normalize(query):
+        return " ".join(query.lower().split())
+
+    def key(self, base_url, query):
+        return f"{base_url}|{self.normalize(query)}"
+
+    def load_index(self):
+        try:
+            with open(self.index_filename, "r") as file:
+                index = json.load(file)
+            return index if isinstance(index, dict) else {}
+        except (IOError, ValueError):
+            # print("RSS cache index missing or unreadable, starting empty")
+            return {}
+
+    def save_index(self):
+        temp_filename = self.index_filename + ".tmp"
+        try:
+            with open(temp_filename, "w") as file:
+                json.dump(self.index, file)
+            os.replace(temp_filename, self.index_filename)
+        except IOError:
+            pass
+            # print("Could not save the RSS cache index")
+
+    def count(self, counter):
+        with self.lock:
+            self.counters[counter] += 1
+
+    def lookup(self, key):
+        # (body, fresh): body is None when nothing usable is cached
+        with self.lock:
+            meta = self.index.get(key)
+            if meta is None:
+                return None, False
+            try:
+                with open(os.path.join(self.directory, meta["file"]), "rb") as file:
+                    body = file.read()
+            except IOError:
+                del self.index[key]
+                return None, False
+            meta["last_used"] = time.time()  # saved with the next write
+            return body, time.time() < meta["expires"]
+
+    def validators(self, key):
+        # Conditional request headers for a stale entry
+        with self.lock:
+            meta = self.index.get(key, {})
+            headers = {}
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+            return headers
+
+    def touch(self, key, ttl=None):
+        # The server said 304: keep the body for another TTL
+        with self.lock:
+            meta = self.index.get(key)
+            if meta is not None:
+                meta["expires"] = time.time() + (self.ttl if ttl is None else ttl)
+                self.save_index()
+
+    def store(self, key, body, etag=None, last_modified=None, ttl=None):
+        now = time.time()
+        filename = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".xml"
+        with self.lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                temp_filename = os.path.join(self.directory, filename + ".tmp")
+                with open(temp_filename, "wb") as file:
+                    file.write(body)
+                os.replace(temp_filename, os.path.join(self.directory, filename))
+            except IOError:
+                return
+                # print("Could not write the RSS cache entry")
+            self.index[key] = {"file": filename, "size": len(body), "etag": etag, "last_modified": last_modified,
+                               "expires": now + (self.ttl if ttl is None else ttl), "last_used": now}
+            self.evict()
+            self.save_index()
+
+    def evict(self):
+        # Drop least recently used bodies until the cache fits (lock held)
+        total = sum(meta["size"] for meta in self.index.values())
+        for key in sorted(self.index, key=lambda cached: self.index[cached]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            meta = self.index.pop(key)
+            total -= meta["size"]
+            self.counters["evictions"] += 1
+            try:
+                os.remove(os.path.join(self.directory, meta["file"]))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters, entries=len(self.index),
+                        bytes=sum(meta["size"] for meta in self.index.values()))
+
+
+def response_ttl(headers, default):
+    # Cache-Control max-age if the server sent one, otherwise our own TTL
+    match = re.search(r"max-age=(\d+)", headers.get("Cache-Control", ""))
+    return int(match.group(1)) if match else default
+
+
+shared_rss_cache = None
+
+
+def get_rss_cache():
+    # One cache for every tab's searches
+    global shared_rss_cache
+    if shared_rss_cache is None:
+        shared_rss_cache = RssCache()
+    return shared_rss_cache
+
+
+class NyaaClient:
+    # Blocking Nyaa search: the feed comes from the RSS cache or is streamed from the server, parsed
+    # item by item and ranked into the best `limit` results by seeders.
+    def __init__(self, base_url=NYAA_BASE_URL, timeout=NYAA_TIMEOUT, cache=None, http=None, limit=NYAA_TOP_RESULTS):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.limit = limit
+        self.cache = cache or get_rss_cache()
+        self.http = http or get_http_client()
+
+    def fetch_chunks(self, query):
+        # The RSS body for the query, yielded in chunks as it arrives. A cached body is used while fresh
+        # (or after a 304); a downloaded one is cached only once it has been read to the end.
+        key = self.cache.key(self.base_url, query)
+        body, fresh = self.cache.lookup(key)
+        if fresh:
+            self.cache.count("hits")
+            yield body
+            return
+        headers = self.cache.validators(key) if body is not None else {}
+        response = self.http.get(f"{self.base_url}/", params={"page": "rss", "q": query, "c": "0_0", "f": "0"},
+                                 headers=headers, timeout=self.timeout, stream=True)
+        with response:
+            ttl = response_ttl(response.headers, self.cache.ttl)
+            if response.status_code == 304 and body is not None:
+                self.cache.touch(key, ttl)
+                self.cache.count("revalidated")
+                yield body
+                return
+            response.raise_for_status()  # Raise an exception for HTTP errors
+            chunks = []
+            for chunk in response.iter_content(NYAA_CHUNK_BYTES):
+                chunks.append(chunk)
+                yield chunk
+            self.cache.store(key, b"".join(chunks), response.headers.get("ETag"),
+                             response.headers.get("Last-Modified"), ttl)
+            self.cache.count("misses")
+
+    def search(self, query, on_batch=None, wanted=None):
+        # Top results, most seeders first. on_batch(items) gets the items that just made the top results
+        # while the feed is still arriving; if wanted() turns False the search stops and returns None.
+        # Raises requests.RequestException, or ET.ParseError/AttributeError/ValueError for a broken feed.
+        top = TopResults(self.limit)
+        pending = []
+        last_batch = time.monotonic()
+        for item in iter_nyaa_items(self.fetch_chunks(query)):
+            if wanted is not None and not wanted():
+                return None  # superseded or abandoned; stop reading
+            if top.add(item):
+                pending.append(item)
+            due = time.monotonic() - last_batch >= NYAA_BATCH_MS / 1000
+            if on_batch is not None and (len(pending) >= NYAA_BATCH_ITEMS or (pending and due)):
+                on_batch(pending)
+                pending = []
+                last_batch = time.monotonic()
+        if wanted is not None and not wanted():
+            return None
+        if pending and on_batch is not None:
+            on_batch(pending)
+        return top.ordered()
+
+
+def torrent_path(url, name):
+    # Where a result's .torrent is saved: Torrent/<name>_<file name from the url>
+    return os.path.join(os.getcwd(), TORRENT_DIR, name + '_' + os.path.basename(url))
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+def stream_download(http, url, target, on_progress=None, cancelled=None):
+    # Stream `url` in chunks to <target>.part and rename it into place once complete, so `target` never
+    # holds half a file. on_progress(received, total) follows each chunk (total is 0 if unknown);
+    # cancelled() is checked between chunks. The partial file is removed on any failure.
+    import requests
+    temp_filename = target + ".part"
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with http.get(url, stream=True) as response:
+            response.raise_for_status()
+            total = int(response.headers.get("Content-Length") or 0)
+            received = 0
+            with open(temp_filename, "wb") as file:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_BYTES):
+                    if cancelled is not None and cancelled():
+                        raise DownloadCancelled()
+                    file.write(chunk)
+                    received += len(chunk)
+                    if on_progress is not None:
+                        on_progress(received, total)
+        os.replace(temp_filename, target)
+    except (DownloadCancelled, requests.RequestException, OSError):
+        try:
+            os.remove(temp_filename)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,259 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from .entries import DATE_TIME_FORMAT, EntryStore, SqliteEntryStore, parse_date_time
+
+CONFIG_FILE = os.path.join("Data", f"tabs_config.json")
+
+# Storage backend: "json" (Data/*.json + journals) or "sqlite" (one-way migration of the json files into SQLITE_FILE)
+STORAGE_BACKEND = os.environ.get("SCHEDULE_STORAGE", "json")
+SQLITE_FILE = os.path.join("Data", "schedule.db")
+
+
+class JsonStorage:
+    # Original layout: Data/tabs_config.json plus one json file (and journal) per tab
+    def open_store(self, filename):
+        return EntryStore(filename)
+
+    def load_tabs(self):
+        try:
+            with open(CONFIG_FILE, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def save_tabs(self, tabs_info, current_tab_index):
+        with open(CONFIG_FILE, "w") as file:
+            json.dump({"tabs_info": tabs_info, "current_tab_index": current_tab_index}, file)
+
+
+class SqliteStorage:
+    # Tabs and entries as tables in one database. Dates are stored as "YYYY-MM-DD HH:MM" so they
+    # sort in date order; "N/A"/"Invalid Date" are kept as text and sort after every date.
+    ENTRY_COLUMNS = ("name", "episode", "datetime", "status", "alarm", "snooze")
+    DB_DATE_TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+    def __init__(self, db_filename=SQLITE_FILE):
+        # Shared between the GUI thread and the save writer thread, so access goes through the lock
+        self.connection = sqlite3.connect(db_filename, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.create_schema()
+        self.migrate_json()
+
+    def create_schema(self):
+        with self.lock, self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS tabs (
+                    filename TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    tab_position INTEGER NOT NULL,
+                    tab_schema TEXT,
+                    sound TEXT
+                );
+                CREATE TABLE IF NOT EXISTS entries (
+                    filename TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    entry_position INTEGER NOT NULL,
+                    name TEXT NOT NULL DEFAULT '',
+                    episode TEXT,
+                    datetime TEXT NOT NULL DEFAULT 'N/A',
+                    status INTEGER NOT NULL DEFAULT 0,
+                    alarm INTEGER NOT NULL DEFAULT 0,
+                    snooze INTEGER NOT NULL DEFAULT 0,
+                    extra TEXT,
+                    PRIMARY KEY (filename, key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_position ON entries (filename, entry_position);
+                -- sorting and alarms work from memory; these only slowed down every write
+                DROP INDEX IF EXISTS idx_entries_datetime;
+                DROP INDEX IF EXISTS idx_entries_status;
+            """)
+            # Databases created before tab schemas and alarm sounds were saved
+            tab_columns = [row[1] for row in self.connection.execute("PRAGMA table_info(tabs)")]
+            if "tab_schema" not in tab_columns:
+                self.connection.execute("ALTER TABLE tabs ADD COLUMN tab_schema TEXT")
+            if "sound" not in tab_columns:
+                self.connection.execute("ALTER TABLE tabs ADD COLUMN sound TEXT")
+
+    def migrate_json(self):
+        # One-way import of tabs_config.json and the tab files; the json files are left untouched
+        with self.lock:
+            migrated = self.connection.execute("SELECT value FROM settings WHERE key = 'json_migrated'").fetchone()
+        if migrated:
+            return
+
+        data = JsonStorage().load_tabs()
+        if isinstance(data, dict) and "tabs_info" in data:
+            tabs_info = data["tabs_info"]
+            current_tab_index = data.get("current_tab_index", 0)
+        elif isinstance(data, list):
+            tabs_info = data
+            current_tab_index = 0
+        else:
+            tabs_info = []
+            current_tab_index = 0
+
+        with self.lock, self.connection:
+            for tab_info in tabs_info:
+                store = EntryStore(tab_info["filename"], read_only=True)  # replays the journal, writes nothing
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self.entry_to_row(tab_info["filename"], key, store.entries[key]) for key in store.order])
+            self.write_tabs(tabs_info, current_tab_index)
+            self.connection.execute("INSERT OR REPLACE INTO settings VALUES ('json_migrated', '1')")
+
+    def to_db_date_time(self, date_time_str):
+        date_time = parse_date_time(date_time_str)
+        return date_time.strftime(self.DB_DATE_TIME_FORMAT) if date_time is not None else date_time_str
+
+    def from_db_date_time(self, value):
+        try:
+            return datetime.strptime(value, self.DB_DATE_TIME_FORMAT).strftime(DATE_TIME_FORMAT)
+        except ValueError:
+            return value
+
+    def entry_to_row(self, filename, key, entry):
+        extra = {field: value for field, value in entry.items()
+                 if field not in self.ENTRY_COLUMNS and field != "entry_position"}
+        return (filename, key, entry["entry_position"], entry.get("name", ""), entry.get("episode"),
+                self.to_db_date_time(entry.get("datetime", "N/A")), bool(entry.get("status", False)),
+                bool(entry.get("alarm", False)), bool(entry.get("snooze", False)),
+                json.dumps(extra) if extra else None)
+
+    def row_to_entry(self, row):
+        key, entry_position, name, episode, date_time, status, alarm, snooze, extra = row
+        entry = {"entry_position": entry_position, "name": name}
+        if episode is not None:
+            entry["episode"] = episode
+        entry.update({"datetime": self.from_db_date_time(date_time), "status": bool(status),
+                      "alarm": bool(alarm), "snooze": bool(snooze)})
+        if extra:
+            entry.update(json.loads(extra))
+        return key, entry
+
+    def fetch_entries(self, filename):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT key, entry_position, name, episode, datetime, status, alarm, snooze, extra "
+                "FROM entries WHERE filename = ? ORDER BY entry_position", (filename,)).fetchall()
+        return dict(self.row_to_entry(row) for row in rows)
+
+    def apply(self, filename, records):
+        # Runs on the writer thread; one transaction per flush
+        with self.lock, self.connection:
+            for record in records:
+                self.apply_record(filename, record)
+
+    def apply_record(self, filename, record):
+        op = record["op"]
+        key = record["key"]
+        execute = self.connection.execute
+        if op == "set":
+            field, value = record["field"], record["value"]
+            if field == "datetime":
+                value = self.to_db_date_time(value)
+            if field in self.ENTRY_COLUMNS:
+                execute(f"UPDATE entries SET {field} = ? WHERE filename = ? AND key = ?", (value, filename, key))
+            else:
+                row = execute("SELECT extra FROM entries WHERE filename = ? AND key = ?", (filename, key)).fetchone()
+                if row is not None:
+                    extra = json.loads(row[0]) if row[0] else {}
+                    extra[field] = value
+                    execute("UPDATE entries SET extra = ? WHERE filename = ? AND key = ?",
+                            (json.dumps(extra), filename, key))
+        elif op == "insert":
+            execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self.entry_to_row(filename, key, record["entry"]))
+        elif op == "delete":
+            row = execute("SELECT entry_position FROM entries WHERE filename = ? AND key = ?",
+                          (filename, key)).fetchone()
+            if row is not None:
+                execute("DELETE FROM entries WHERE filename = ? AND key = ?", (filename, key))
+                execute("UPDATE entries SET entry_position = entry_position - 1 "
+                        "WHERE filename = ? AND entry_position > ?", (filename, row[0]))
+        elif op == "move":
+            row = execute("SELECT entry_position FROM entries WHERE filename = ? AND key = ?",
+                          (filename, key)).fetchone()
+            if row is not None:
+                old_row, new_row = row[0], record["row"]
+                if old_row < new_row:
+                    execute("UPDATE entries SET entry_position = entry_position - 1 "
+                            "WHERE filename = ? AND entry_position > ? AND entry_position <= ?",
+                            (filename, old_row, new_row))
+                elif old_row > new_row:
+                    execute("UPDATE entries SET entry_position = entry_position + 1 "
+                            "WHERE filename = ? AND entry_position >= ? AND entry_position < ?",
+                            (filename, new_row, old_row))
+                execute("UPDATE entries SET entry_position = ? WHERE filename = ? AND key = ?",
+                        (new_row, filename, key))
+        elif op == "delete_rows":
+            # Delete the rows, then renumber everything after the first one once
+            execute_many = self.connection.executemany
+            execute_many("DELETE FROM entries WHERE filename = ? AND key = ?",
+                         [(filename, deleted_key) for deleted_key in record["keys"]])
+            rest = [row[0] for row in execute(
+                "SELECT key FROM entries WHERE filename = ? AND entry_position > ? ORDER BY entry_position",
+                (filename, record["start"]))]
+            execute_many("UPDATE entries SET entry_position = ? WHERE filename = ? AND key = ?",
+                         [(position, filename, rest_key) for position, rest_key in enumerate(rest, record["start"])])
+        elif op == "move_rows":
+            # Renumber only the span the block moved across
+            start, stop = record["start"], record["stop"]
+            span = [row[0] for row in execute(
+                "SELECT key FROM entries WHERE filename = ? AND entry_position >= ? AND entry_position < ? "
+                "ORDER BY entry_position", (filename, start, stop))]
+            moving = set(record["keys"])
+            rest = [span_key for span_key in span if span_key not in moving]
+            insert_at = record["row"] - start
+            span = rest[:insert_at] + [span_key for span_key in record["keys"] if span_key in span] + rest[insert_at:]
+            self.connection.executemany(
+                "UPDATE entries SET entry_position = ? WHERE filename = ? AND key = ?",
+                [(position, filename, span_key) for position, span_key in enumerate(span, start)])
+
+    def delete_entries(self, filename):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM entries WHERE filename = ?", (filename,))
+
+    def open_store(self, filename):
+        return SqliteEntryStore(self, filename)
+
+    def load_tabs(self):
+        with self.lock:
+            tabs = self.connection.execute(
+                "SELECT name, filename, tab_schema, sound FROM tabs ORDER BY tab_position").fetchall()
+            current = self.connection.execute(
+                "SELECT value FROM settings WHERE key = 'current_tab_index'").fetchone()
+        if not tabs:
+            return None
+        return {"tabs_info": [{"name": name, "filename": filename, "schema": json.loads(schema) if schema else None,
+                               "sound": sound}
+                              for name, filename, schema, sound in tabs],
+                "current_tab_index": int(current[0]) if current else 0}
+
+    def save_tabs(self, tabs_info, current_tab_index):
+        with self.lock, self.connection:
+            self.write_tabs(tabs_info, current_tab_index)
+
+    def write_tabs(self, tabs_info, current_tab_index):
+        self.connection.execute("DELETE FROM tabs")
+        self.connection.executemany("INSERT OR REPLACE INTO tabs (filename, name, tab_position, tab_schema, sound) "
+                                    "VALUES (?, ?, ?, ?, ?)",
+                                    [(tab_info["filename"], tab_info["name"], position,
+                                      json.dumps(tab_info["schema"]) if tab_info.get("schema") else None,
+                                      tab_info.get("sound"))
+                                     for position, tab_info in enumerate(tabs_info)])
+        self.connection.execute("INSERT OR REPLACE INTO settings VALUES ('current_tab_index', ?)",
+                                (str(current_tab_index),))
+
+
+def open_storage(backend=STORAGE_BACKEND):
+    if backend == "sqlite":
+        return SqliteStorage()
+    return JsonStorage()
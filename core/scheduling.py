@@ -0,0 +1,125 @@
+import re
+import heapq
+from datetime import datetime, timedelta
+from functools import partial
+
+from .entries import format_date_time
+
+
+class DeadlineHeap:
+    # Min-heap of (deadline, key). Re-scheduling a key just pushes a new item; stale items are
+    # skipped when they reach the top, and the heap is rebuilt once they outnumber the live ones.
+    def __init__(self):
+        self.heap = []
+        self.deadlines = {}  # key -> current deadline
+
+    def __len__(self):
+        return len(self.deadlines)
+
+    def schedule(self, key, deadline):
+        if deadline is None:
+            self.discard(key)
+            return
+        if self.deadlines.get(key) == deadline:
+            return
+        self.deadlines[key] = deadline
+        heapq.heappush(self.heap, (deadline, key))
+        if len(self.heap) > 2 * len(self.deadlines) + 64:
+            self.heap = [(deadline, key) for key, deadline in self.deadlines.items()]
+            heapq.heapify(self.heap)
+
+    def discard(self, key):
+        self.deadlines.pop(key, None)
+
+    def schedule_all(self, deadlines):
+        # Bulk version of schedule() for [(deadline, key)]: one heapify instead of a push per key
+        for deadline, key in deadlines:
+            self.deadlines[key] = deadline
+        self.heap = [(deadline, key) for key, deadline in self.deadlines.items()]
+        heapq.heapify(self.heap)
+
+    def clear(self):
+        self.heap = []
+        self.deadlines = {}
+
+    def peek(self):
+        while self.heap:
+            deadline, key = self.heap[0]
+            if self.deadlines.get(key) == deadline:
+                return deadline, key
+            heapq.heappop(self.heap)
+        return None
+
+    def pop_due(self, now):
+        due = []
+        while True:
+            top = self.peek()
+            if top is None or top[0] > now:
+                return due
+            heapq.heappop(self.heap)
+            del self.deadlines[top[1]]
+            due.append(top[1])
+
+
+class SortIndex:
+    # Cached per-entry sort keys for sort mode. Keys are computed once per entry and field and
+    # dropped when the entry changes, so re-sorting never re-parses dates or episode text.
+    FIELDS = ("name", "episode", "datetime", "countdown", "status")
+
+    def __init__(self, store):
+        self.store = store
+        self.cache = {field: {} for field in self.FIELDS}
+
+    def invalidate(self, key):
+        for keys in self.cache.values():
+            keys.pop(key, None)
+
+    def sort_key(self, field, key):
+        keys = self.cache[field]
+        value = keys.get(key)
+        if value is None:
+            value = keys[key] = self.compute(field, key)
+        return value
+
+    def compute(self, field, key):
+        entry = self.store.entries[key]
+        if field == "name":
+            return entry.get("name", "").casefold()
+        if field == "episode":
+            # Natural order: "S01 E-10" after "S01 E-9"
+            return tuple((0, int(part), "") if part.isdigit() else (1, 0, part.casefold())
+                         for part in re.split(r"(\d+)", entry.get("episode", "")) if part)
+        if field == "status":
+            return bool(entry["status"])
+        date_time = self.store.timestamp(key)
+        if field == "datetime":
+            # entries without a date go last (first when descending)
+            return (0, date_time) if date_time is not None else (1, datetime.max)
+        # countdown: running/overtime by time left, then completed, then no date
+        if date_time is None:
+            return (2, datetime.max)
+        return (1, date_time) if entry["status"] else (0, date_time)
+
+    def ordered(self, keys, sort_columns):
+        # sort_columns: [(field, descending), ...], most significant first. Sorting from the least
+        # significant column up relies on sort stability; remaining ties keep the order of `keys`.
+        keys = list(keys)
+        for field, descending in reversed(sort_columns):
+            keys.sort(key=partial(self.sort_key, field), reverse=descending)
+        return keys
+
+
+def next_week_changes(entry, date_time):
+    # "+1 Week" for a completed episode: the changes that move it to next week's episode, or None.
+    # date_time is the entry's pre-parsed date; entries without one, or without "E-<n>" in the
+    # episode, don't recur.
+    if not entry["status"]:
+        return None
+    episode_text = entry.get("episode", "")
+    number_match = re.search(r'E-(\d+)', episode_text)  # finding episode number
+    if number_match and date_time is not None:  # if episode number format is found [S01 E01]
+        new_date_time = date_time + timedelta(weeks=1)
+        episode_number = int(number_match.group(1)) + 1
+        new_episode = re.sub(r'E-\d+', f'E-{episode_number:02}', episode_text)
+        return {"datetime": format_date_time(new_date_time), "episode": new_episode, "status": False}
+    return None
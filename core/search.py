@@ -0,0 +1,197 @@
+import re
+import bisect
+import heapq
+import unicodedata
+from collections import deque
+from functools import partial
+
+SEARCH_RESULTS = 50
+PREFIX_WORDS = 500  # distinct words a short prefix may expand to; keeps one-letter queries fast
+FUZZY_MIN_LENGTH = 4  # shorter query words only match exactly or by prefix
+EXACT_SCORE, PREFIX_SCORE, FUZZY_SCORE = 3, 2, 1
+INDEX_BATCH_ENTRIES = 500  # entries indexed per index_some() call; a few ms, so the GUI stays responsive
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def name_words(name):
+    # Lowercase words with accents stripped: "Frieren: Beyond Journey's End" -> frieren, beyond, journey, s, end
+    if name.isascii():
+        return WORD_PATTERN.findall(name.lower())  # nothing to strip; most names take this path
+    text = unicodedata.normalize("NFKD", name).casefold()
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return WORD_PATTERN.findall(text)
+
+
+def one_letter_deletions(word):
+    return {word[:position] + word[position + 1:] for position in range(len(word))}
+
+
+def within_one_edit(a, b):
+    # One insertion, deletion, substitution or swap of neighbouring letters
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        differences = [position for position in range(len(a)) if a[position] != b[position]]
+        if len(differences) == 1:
+            return True
+        first, second = differences[0], differences[-1]
+        return len(differences) == 2 and second == first + 1 and a[first] == b[second] and a[second] == b[first]
+    if len(a) > len(b):
+        a, b = b, a
+    position = 0
+    while position < len(a) and a[position] == b[position]:
+        position += 1
+    return a[position:] == b[position + 1:]
+
+
+class NameIndex:
+    # Inverted index over the entry names of every tab: normalized word -> (tab, key) of the entries using it.
+    # Stores report each change record to apply(), so edits, imports and deletes in any tab (opened or not)
+    # are picked up without re-reading the tab. Distinct words are also kept sorted, for prefix matches,
+    # and under their one-letter deletions, for matches one typo away.
+    # Stores can be queued and indexed a slice at a time with index_some(); until then searches only see
+    # the entries indexed so far.
+    def __init__(self):
+        self.postings = {}  # word -> set of (tab, key)
+        self.documents = {}  # (tab, key) -> (name, words)
+        self.tab_keys = {}  # tab -> keys indexed for it
+        self.watched = {}  # tab -> (store, watcher) to detach when the tab goes
+        self.words = []  # sorted distinct words
+        self.deletions = {}  # word minus one letter -> words it came from
+        self.queue = deque()  # (tab, store, keys still to index)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add_store(self, tab, store):
+        # Index the whole store now
+        self.queue_store(tab, store)
+        while self.index_some():
+            pass
+
+    def queue_store(self, tab, store):
+        # Watch the store from now on, but leave its existing entries for index_some()
+        self.remove_tab(tab)
+        self.tab_keys[tab] = set()
+        watcher = partial(self.apply, tab)
+        store.watchers.append(watcher)
+        self.watched[tab] = (store, watcher)
+        self.queue.append((tab, store, deque(store.order)))
+
+    def index_some(self, limit=INDEX_BATCH_ENTRIES):
+        # Index up to `limit` queued entries; True while more are waiting. Entries deleted since they were
+        # queued are skipped, and ones the watcher already indexed (edited meanwhile) are left as they are.
+        done = 0
+        while self.queue and done < limit:
+            tab, store, keys = self.queue[0]
+            while keys and done < limit:
+                key = keys.popleft()
+                entry = store.entries.get(key)
+                if entry is not None and (tab, key) not in self.documents:
+                    self.add(tab, key, entry.get("name", ""))
+                done += 1
+            if not keys:
+                self.queue.popleft()
+        return bool(self.queue)
+
+    def building(self):
+        return bool(self.queue)
+
+    def remove_tab(self, tab):
+        store, watcher = self.watched.pop(tab, (None, None))
+        if store is not None:
+            store.watchers.remove(watcher)
+        self.queue = deque(queued for queued in self.queue if queued[0] != tab)
+        for key in list(self.tab_keys.pop(tab, ())):
+            self.remove(tab, key)
+
+    def apply(self, tab, record):
+        # A store's change record; only name changes, inserts and deletes matter here
+        op = record["op"]
+        if op == "insert":
+            self.add(tab, record["key"], record["entry"].get("name", ""))
+        elif op == "set" and record["field"] == "name":
+            self.add(tab, record["key"], record["value"])
+        elif op == "delete":
+            self.remove(tab, record["key"])
+        elif op == "delete_rows":
+            for key in record["keys"]:
+                self.remove(tab, key)
+
+    def add(self, tab, key, name):
+        self.remove(tab, key)
+        document = (tab, key)
+        words = set(name_words(name))
+        self.documents[document] = (name, words)
+        self.tab_keys.setdefault(tab, set()).add(key)
+        for word in words:
+            documents = self.postings.get(word)
+            if documents is None:
+                documents = self.postings[word] = set()
+                bisect.insort(self.words, word)
+                for deletion in one_letter_deletions(word) | {word}:
+                    self.deletions.setdefault(deletion, set()).add(word)
+            documents.add(document)
+
+    def remove(self, tab, key):
+        document = (tab, key)
+        indexed = self.documents.pop(document, None)
+        if indexed is None:
+            return
+        self.tab_keys.get(tab, set()).discard(key)
+        for word in indexed[1]:
+            documents = self.postings[word]
+            documents.discard(document)
+            if not documents:
+                del self.postings[word]
+                del self.words[bisect.bisect_left(self.words, word)]
+                for deletion in one_letter_deletions(word) | {word}:
+                    variants = self.deletions[deletion]
+                    variants.discard(word)
+                    if not variants:
+                        del self.deletions[deletion]
+
+    def word_matches(self, word):
+        # document -> best score for one query word: the word itself, words it starts, words one typo away
+        matches = dict.fromkeys(self.postings.get(word, ()), EXACT_SCORE)
+        start = bisect.bisect_left(self.words, word)
+        for indexed in self.words[start:start + PREFIX_WORDS]:
+            if not indexed.startswith(word):
+                break
+            if indexed != word:
+                for document in self.postings[indexed]:
+                    matches.setdefault(document, PREFIX_SCORE)
+        if len(word) >= FUZZY_MIN_LENGTH:
+            candidates = set()
+            for deletion in one_letter_deletions(word) | {word}:
+                candidates |= self.deletions.get(deletion, set())
+            for indexed in candidates:
+                if indexed != word and within_one_edit(word, indexed):
+                    for document in self.postings[indexed]:
+                        matches.setdefault(document, FUZZY_SCORE)
+        return matches
+
+    def search(self, query, limit=SEARCH_RESULTS):
+        # [(tab, key, name)] of entries matching every word of the query, best first: exact words over
+        # prefixes over typos, then shorter names
+        scores = None
+        for word in sorted(set(name_words(query)), key=len, reverse=True):
+            matches = self.word_matches(word)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {document: score + matches[document] for document, score in scores.items()
+                          if document in matches}
+            if not scores:
+                return []
+        if scores is None:
+            return []
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (
+            -item[1], len(self.documents[item[0]][0]), self.documents[item[0]][0].casefold()))
+        return [(tab, key, self.documents[(tab, key)][0]) for (tab, key), score in best]
+
+    def stats(self):
+        return {"entries": len(self.documents), "words": len(self.words), "tabs": len(self.tab_keys),
+                "deletion_keys": len(self.deletions), "queued_entries": sum(len(keys) for _, _, keys in self.queue)}
@@ -0,0 +1,212 @@
+# Import/export of a tab's entries. Files are read and written one row at a time, so a large
+# schedule never sits in memory twice.
+import os
+import re
+import csv
+import json
+from datetime import datetime, timezone
+
+from .entries import format_date_time, parse_date_time
+
+MAX_REPORTED_IMPORT_ERRORS = 10
+
+
+def file_format(path):
+    return {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".ics": "ics"}.get(os.path.splitext(path)[1].lower())
+
+
+def import_flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in ("1", "true", "yes", "y", "x", "done", "completed")
+
+
+def import_date_time(value):
+    # "N/A" for no date, the app's own format for a valid one, None if it can't be read
+    value = str(value or "").strip()
+    if value in ("", "N/A"):
+        return "N/A"
+    date_time = parse_date_time(value)
+    if date_time is None:
+        try:
+            date_time = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+        if date_time.tzinfo is not None:
+            date_time = date_time.astimezone().replace(tzinfo=None)  # local time, like everything else
+    return format_date_time(date_time)
+
+
+def ics_unfold(file):
+    # Yields (line_number, logical_line); continuation lines start with a space or tab
+    pending, pending_number = None, 0
+    for line_number, line in enumerate(file, 1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending_number, pending
+        pending, pending_number = line, line_number
+    if pending is not None:
+        yield pending_number, pending
+
+
+def ics_unescape(value):
+    return re.sub(r"\\([\\;,nN])", lambda match: "\n" if match.group(1) in "nN" else match.group(1), value)
+
+
+def ics_escape(value):
+    return str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def ics_property(column):
+    # Column name -> X- property name. Only letters, digits and "-" are allowed there, so anything else
+    # (including "-" itself) is written as -<hex code>-: "my col" -> X-SCHEDULE-MY-20-COL
+    return "X-SCHEDULE-" + "".join(char.upper() if char.isascii() and char.isalnum() else f"-{ord(char):X}-"
+                                   for char in column)
+
+
+def ics_column(name):
+    # X-SCHEDULE-... property name -> lower-cased column name
+    return re.sub(r"-([0-9A-F]+)-", lambda match: chr(int(match.group(1), 16)), name[len("X-SCHEDULE-"):]).lower()
+
+
+def ics_fold(line):
+    # Content lines longer than 75 characters continue on lines starting with a space
+    return "\r\n ".join(line[start:start + 74] for start in range(0, max(len(line), 1), 74))
+
+
+def ics_date_time(value):
+    value = value.strip()
+    try:
+        if "T" not in value:
+            return format_date_time(datetime.strptime(value[:8], "%Y%m%d"))  # all-day: midnight
+        date_time = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+    except ValueError:
+        return value  # left for import_date_time to reject
+    if value.endswith("Z"):
+        date_time = date_time.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    return format_date_time(date_time)
+
+
+def read_ics_events(file):
+    event, event_line = None, 0
+    for line_number, line in ics_unfold(file):
+        name, _, value = line.partition(":")
+        name = name.split(";")[0].upper()  # parameters (TZID, VALUE=DATE) are not needed
+        if name == "BEGIN" and value.strip().upper() == "VEVENT":
+            event, event_line = {}, line_number
+        elif name == "END" and value.strip().upper() == "VEVENT" and event is not None:
+            yield event_line, event
+            event = None
+        elif event is not None:
+            if name == "SUMMARY":
+                event["name"] = ics_unescape(value)
+            elif name == "DTSTART":
+                event["datetime"] = ics_date_time(value)
+            elif name.startswith("X-SCHEDULE-"):
+                event[ics_column(name)] = ics_unescape(value)
+
+
+def read_import_records(path):
+    # Yields (line_number, record) with lower-cased field names
+    file_type = file_format(path)
+    if file_type is None:
+        raise ValueError(f"Unsupported file type: {os.path.basename(path)}")
+    with open(path, "r", newline="", encoding="utf-8-sig") as file:
+        if file_type == "csv":
+            reader = csv.DictReader(file)
+            for record in reader:
+                yield reader.line_num, {str(field).strip().lower(): value for field, value in record.items() if field}
+        elif file_type == "jsonl":
+            for line_number, line in enumerate(file, 1):
+                if line.strip():
+                    record = json.loads(line)
+                    if isinstance(record, dict):
+                        yield line_number, {str(field).lower(): value for field, value in record.items()}
+        else:
+            yield from read_ics_events(file)
+
+
+def import_entry(record, schema):
+    # Import record -> entry dict for this tab, or (None, reason)
+    name = str(record.get("name") or "").strip()
+    if not name:
+        return None, "missing name"
+    date_time = import_date_time(record.get("datetime", record.get("date")))
+    entry = {"name": name,
+             "datetime": date_time if date_time is not None else "Invalid Date",
+             "status": import_flag(record.get("status")),
+             "alarm": import_flag(record.get("alarm")),
+             "snooze": False}
+    entry["snooze"] = entry["alarm"] and import_flag(record.get("snooze"))
+    if schema.watch:
+        entry["episode"] = str(record.get("episode") or "S01 E-00")
+    for column in schema.extra_columns:
+        if column.lower() in record:
+            entry[column] = str(record[column.lower()])
+    return entry, None if date_time is not None else f"invalid date '{record.get('datetime', record.get('date'))}'"
+
+
+def check_import_file(path, schema):
+    # First pass over the file: counts rows and collects problems without keeping the rows
+    rows, problems, examples = 0, 0, []
+    for line_number, record in read_import_records(path):
+        rows += 1
+        _, problem = import_entry(record, schema)
+        if problem:
+            problems += 1
+            if len(examples) < MAX_REPORTED_IMPORT_ERRORS:
+                examples.append(f"line {line_number}: {problem}")
+    return rows, problems, examples
+
+
+def iter_import_entries(path, schema):
+    # Second pass: entries to insert; rows without a name are skipped, bad dates become "Invalid Date"
+    for _, record in read_import_records(path):
+        entry, _ = import_entry(record, schema)
+        if entry is not None:
+            yield entry
+
+
+def export_columns(schema):
+    return [column for column in schema.columns if column not in ("countdown", "next")]
+
+
+def export_entries(path, store, schema):
+    file_type = file_format(path)
+    if file_type is None:
+        raise ValueError(f"Unsupported file type: {os.path.basename(path)}")
+    columns = export_columns(schema)
+    exported = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        if file_type == "csv":
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            for entry in store.rows():
+                writer.writerow([entry.get(column, "") for column in columns])
+                exported += 1
+        elif file_type == "jsonl":
+            for entry in store.rows():
+                file.write(json.dumps({column: entry.get(column, "") for column in columns}) + "\n")
+                exported += 1
+        else:
+            file.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//ScheduleApp//EN\r\n")
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            tab_id = os.path.splitext(os.path.basename(store.filename))[0]
+            for key in store.order:
+                date_time = store.timestamp(key)
+                if date_time is None:
+                    continue  # an event needs a start; undated entries only go to csv/jsonl
+                entry = store.entries[key]
+                lines = ["BEGIN:VEVENT", f"UID:{tab_id}-{key}@scheduleapp", f"DTSTAMP:{stamp}",
+                         f"DTSTART:{date_time.strftime('%Y%m%dT%H%M%S')}", f"SUMMARY:{ics_escape(entry['name'])}"]
+                for column in columns:
+                    if column not in ("name", "datetime"):
+                        lines.append(f"{ics_property(column)}:{ics_escape(entry.get(column, ''))}")
+                lines.append("END:VEVENT")
+                file.write("\r\n".join(ics_fold(line) for line in lines) + "\r\n")
+                exported += 1
+            file.write("END:VCALENDAR\r\n")
+    return exported
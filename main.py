@@ -1,34 +1,65 @@
+import time
+STARTUP_STARTED = time.perf_counter()  # launch time for the startup report, taken before the other imports
 import os
 import sys
+import csv
 import json
-import re
-import requests
-import xml.etree.ElementTree as ET
+import bisect
+import threading
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
 from datetime import datetime, timedelta
 from PySide2.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                               QHBoxLayout, QPushButton, QTableWidget,
-                               QTableWidgetItem, QHeaderView, QAbstractItemView,
+                               QHBoxLayout, QPushButton, QTableView, QStyledItemDelegate,
+                               QHeaderView, QAbstractItemView,
                                QLineEdit, QDateTimeEdit, QCheckBox, QComboBox, QTabWidget, QLabel, QInputDialog,
                                QDateEdit, QTimeEdit, QMessageBox, QMenu, QSystemTrayIcon, QAction, QStyle, QDialog,
-                               QScrollArea, QGridLayout)
-from PySide2.QtCore import Qt, QTimer, QTime, QDate, QRegExp, QDateTime, QPoint, QRect, QEvent
-from PySide2.QtGui import QRegExpValidator, QIcon
-import pygame
+                               QFileDialog, QListWidget, QListWidgetItem)
+from PySide2.QtCore import (Qt, QObject, Signal, QAbstractTableModel, QModelIndex, QMimeData, QByteArray,
+                            QItemSelection, QItemSelectionModel, QTimer, QTime, QDate, QRegExp, QDateTime, QPoint,
+                            QRect, QEvent)
+from PySide2.QtGui import QRegExpValidator, QIcon, QColor, QPixmap
+# requests, pygame and xml.etree are imported where they are used: none of them is needed to show the window
+from core import (NYAA_BASE_URL, NYAA_TIMEOUT, NYAA_TOP_RESULTS, DeadlineHeap, DownloadCancelled, JsonStorage,
+                  NameIndex, NyaaClient, SortIndex, TabSchema, check_import_file, close_http_client, countdown_text,
+                  export_entries, get_http_client, iter_import_entries, next_week_changes, nyaa_query, open_storage,
+                  parse_date_time, stream_download, torrent_path)
 
 # Global variables
 last_alarm_time = None
 COOLDOWN_PERIOD = timedelta(minutes=2)
 SNOOZE_PERIOD = timedelta(minutes=3)
+MAX_ALARM_TIMER_MS = 60 * 1000  # re-check at least once a minute so clock changes/sleep don't delay alarms
 
-CONFIG_FILE = os.path.join("Data", f"tabs_config.json")
+SAVE_QUIET_MS = 500  # edits are written once no new edit has arrived for this long
+
+FETCH_BATCH_ROWS = 500  # rows handed to the view at a time; more are fetched as it scrolls
+COUNTDOWN_BUFFER_ROWS = 20  # rows above/below the viewport whose countdown is kept fresh
+GLOBAL_SEARCH_DELAY_MS = 150  # the search box waits this long after the last key press before searching
+# Tabs are indexed for the search box a slice at a time (core.search.INDEX_BATCH_ENTRIES) whenever the app is idle
+# Nyaa searches and torrent downloads run on worker threads (the search/download settings live in core.nyaa)
+NYAA_WORKERS = 2
+DOWNLOAD_WORKERS = int(os.environ.get("DOWNLOAD_WORKERS", "3"))  # downloads running at once; the rest queue
+
+# Alarm audio: the mixer is opened once and each sound file decoded once; SDL_AUDIODRIVER=dummy runs it headless
+ALARM_SOUND = "alarm.mp3"
+ALARM_DURATION_MS = 5 * 1000
+AUDIO_CHANNELS = 8  # alarms that overlap play on separate channels
+SOUND_FILE_FILTER = "Sounds (*.mp3 *.ogg *.wav)"
+
+MAX_SORT_KEYS = 3  # columns kept as tie-breakers in sort mode
+CLOCK_TICK_MS = 60 * 1000  # countdowns only show minutes
+CLOCK_MARGIN_MS = 50  # tick just after the minute boundary, not just before it
+
+# "1" prints the per-phase startup timings, any other value is a file to write them to as json
+STARTUP_REPORT = os.environ.get("SCHEDULE_STARTUP_REPORT", "")
 
 outer_layer_styling = "background-color: #0a0f18; color: #00ffff;"
 frame_styling_data = "background: #141e2c; font-size: 15px; border: 1px solid #1c2936; border-radius: 5px;"
 top_layout_styling = "background: #1c2936; border: 1px solid #2a3f55; border-radius: 5px; margin: 5px;"
 
 table_styling_data = """
-    QTableWidget {
+    QTableView {
         font-size: 18px;
         background: #0a0f18;
         color: #00ffff;
@@ -36,7 +67,7 @@ table_styling_data = """
         border: 1px solid #2a3f55;
         border-radius: 5px;
     }
-    QTableWidget QTableCornerButton::section {
+    QTableView QTableCornerButton::section {
         background: #141e2c;
         border: none;
     }
@@ -53,7 +84,7 @@ table_styling_data = """
         padding: 5px;
         border-radius: 3px;
     }
-    QTableWidget::item:selected {
+    QTableView::item:selected {
         background-color: #2a3f55;
         color: #ffffff;
     }
@@ -64,7 +95,7 @@ table_styling_data = """
         padding: 5px;
         border-radius: 3px;
     }
-    QTableWidget::item {
+    QTableView::item {
         padding: 5px;
     }
 """
@@ -156,69 +187,968 @@ resource_path("off.png")
 resource_path("alarm.mp3")
 
 
+# Formats offered by the tab menu's Import.../Export... (read and written by core.transfer)
+IMPORT_EXPORT_FILTER = "Schedules (*.csv *.jsonl *.ics)"
+
+
+class AlarmScheduler(QObject):
+    # One single-shot timer armed for the nearest deadline instead of scanning every row each second
+    def __init__(self, on_due, parent=None):
+        super().__init__(parent)
+        self.on_due = on_due
+        self.deadlines = DeadlineHeap()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.fire)
+
+    def update(self, key, deadline):
+        # deadline None removes the key
+        self.deadlines.schedule(key, deadline)
+        self.rearm()
+
+    def discard(self, key):
+        self.deadlines.discard(key)
+        self.rearm()
+
+    def update_all(self, deadlines):
+        # [(deadline, key)] at once, e.g. a whole tab on load; the timer is armed once
+        self.deadlines.schedule_all(deadlines)
+        self.rearm()
+
+    def rearm(self):
+        top = self.deadlines.peek()
+        if top is None:
+            self.timer.stop()
+            return
+        wait_ms = int((top[0] - datetime.now()).total_seconds() * 1000)
+        self.timer.start(max(0, min(wait_ms, MAX_ALARM_TIMER_MS)))
+
+    def fire(self):
+        for key in self.deadlines.pop_due(datetime.now()):
+            self.on_due(key)
+        self.rearm()
+
+    def stop(self):
+        self.timer.stop()
+        self.deadlines.clear()
+
+
+class SaveScheduler(QObject):
+    # Coalesces bursts of save requests: tabs are marked dirty and flushed once after a quiet period.
+    # Table -> store syncing happens on the GUI thread, the actual file writes on a single writer thread
+    # (one thread keeps each tab's writes in order).
+    def __init__(self, parent=None, quiet_ms=SAVE_QUIET_MS):
+        super().__init__(parent)
+        self.quiet_ms = quiet_ms
+        self.dirty = {}  # insertion-ordered set of objects with prepare_save()
+        self.writer = ThreadPoolExecutor(max_workers=1)
+        self.in_flight = []
+        self.requests = 0  # save requests received
+        self.writes = 0  # write jobs actually issued
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    def mark_dirty(self, target):
+        self.requests += 1
+        self.dirty[target] = None
+        self.timer.start(self.quiet_ms)  # restart the quiet period
+
+    def discard(self, target):
+        self.dirty.pop(target, None)
+
+    def flush(self, wait=False):
+        self.timer.stop()
+        targets = list(self.dirty)
+        self.dirty.clear()
+        for target in targets:
+            job = target.prepare_save()
+            if job is not None:
+                self.writes += 1
+                self.in_flight.append(self.writer.submit(job))
+        self.in_flight = [future for future in self.in_flight if not future.done()]
+        if wait:
+            futures_wait(self.in_flight)
+            self.in_flight = []
+
+    def stats(self):
+        return {"requests": self.requests, "writes": self.writes,
+                "coalesced": self.requests - self.writes, "pending": len(self.dirty)}
+
+
+class NyaaSearch(QObject):
+    # Runs NyaaClient searches on a small worker pool; results come back through signals, which Qt queues
+    # onto the GUI thread. The feed is parsed while it downloads and new top results are sent in
+    # batches, so the first ones show before the rest has arrived. A new search cancels the previous
+    # one: dropped if it hasn't started, otherwise it stops at its next item.
+    started = Signal(int, str)  # search id, query
+    batch = Signal(int, list)  # search id, items that just made the top results
+    finished = Signal(int, list)  # search id, final top results, most seeders first
+    failed = Signal(int, str)  # search id, message
+
+    def __init__(self, parent=None, base_url=NYAA_BASE_URL, timeout=NYAA_TIMEOUT, workers=NYAA_WORKERS, cache=None,
+                 http=None, limit=NYAA_TOP_RESULTS):
+        super().__init__(parent)
+        self.client = NyaaClient(base_url, timeout, cache, http, limit)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.current = None  # id of the search whose result is still wanted
+        self.future = None
+        self.next_id = 0
+
+    def search(self, query):
+        self.cancel()
+        self.next_id += 1
+        self.current = self.next_id
+        self.started.emit(self.current, query)
+        self.future = self.executor.submit(self.run, self.current, query)
+        return self.current
+
+    def cancel(self):
+        if self.future is not None:
+            self.future.cancel()
+        self.current = None
+        self.future = None
+
+    def is_current(self, search_id):
+        return search_id == self.current
+
+    def run(self, search_id, query):
+        # Worker thread: no widgets here, only the signals
+        import requests
+        import xml.etree.ElementTree as ET
+        url = f"{self.client.base_url}/"
+        try:
+            items = self.client.search(query, partial(self.batch.emit, search_id), partial(self.is_current, search_id))
+        except requests.RequestException as e:
+            if self.is_current(search_id):
+                self.failed.emit(search_id, f"Failed to fetch XML from: {url}\n{e}")
+            return
+        except (ET.ParseError, AttributeError, ValueError) as e:
+            if self.is_current(search_id):
+                self.failed.emit(search_id, f"Failed to parse XML content\n{e}")
+            return
+        if items is not None and self.is_current(search_id):
+            self.finished.emit(search_id, items)
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
+
+
+class DownloadManager(QObject):
+    # Background downloads: queued on a pool of DOWNLOAD_WORKERS and written by stream_download, so Torrent/
+    # never holds half a file. One download per target.
+    queued = Signal(int, str)  # download id, target
+    progress = Signal(int, object, object)  # download id, bytes received, total bytes (0 if unknown)
+    finished = Signal(int, str)  # download id, target
+    failed = Signal(int, str)  # download id, message
+    cancelled = Signal(int)  # download id
+
+    def __init__(self, parent=None, workers=DOWNLOAD_WORKERS, http=None):
+        super().__init__(parent)
+        self.http = http or get_http_client()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+        self.active = {}  # target -> download id, queued or running
+        self.jobs = {}  # download id -> (future, cancel event, target)
+        self.next_id = 0
+
+    def download(self, url, target):
+        # Id of the download fetching `target`: an existing one if it's already queued or running,
+        # None if the file is already there
+        with self.lock:
+            if target in self.active:
+                return self.active[target]
+            if os.path.exists(target):
+                return None
+            self.next_id += 1
+            download_id = self.next_id
+            cancel_event = threading.Event()
+            self.active[target] = download_id
+            future = self.executor.submit(self.run, download_id, url, target, cancel_event)
+            self.jobs[download_id] = (future, cancel_event, target)
+        self.queued.emit(download_id, target)
+        return download_id
+
+    def cancel(self, download_id):
+        with self.lock:
+            job = self.jobs.get(download_id)
+        if job is None:
+            return
+        future, cancel_event, target = job
+        cancel_event.set()  # a running download stops at its next chunk
+        if future.cancel():
+            self.forget(download_id)
+            self.cancelled.emit(download_id)
+
+    def forget(self, download_id):
+        with self.lock:
+            job = self.jobs.pop(download_id, None)
+            if job is not None:
+                self.active.pop(job[2], None)
+
+    def is_active(self, download_id):
+        with self.lock:
+            return download_id in self.jobs
+
+    def run(self, download_id, url, target, cancel_event):
+        # Worker thread
+        import requests
+        try:
+            stream_download(self.http, url, target, partial(self.progress.emit, download_id), cancel_event.is_set)
+        except DownloadCancelled:
+            self.cancelled.emit(download_id)
+            return
+        except (requests.RequestException, OSError) as e:
+            self.failed.emit(download_id, f"Failed to download: {url}\n{e}")
+            return
+        finally:
+            self.forget(download_id)  # whatever happened, the target can be downloaded again
+        self.finished.emit(download_id, target)
+
+    def shutdown(self):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        for future, cancel_event, target in jobs:
+            cancel_event.set()
+            future.cancel()
+        self.executor.shutdown(wait=False)
+
+
+shared_download_manager = None
+
+
+def get_download_manager():
+    # One download queue for every tab, so the concurrency limit is app-wide
+    global shared_download_manager
+    if shared_download_manager is None:
+        shared_download_manager = DownloadManager()
+    return shared_download_manager
+
+
+class AppClock(QObject):
+    # One clock for all tabs instead of a 1 s QTimer each. Ticks on minute boundaries and only
+    # calls subscribers whose widget is actually on screen.
+    def __init__(self, parent=None, interval_ms=CLOCK_TICK_MS):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.subscribers = {}  # callback -> widget it updates (None = always call)
+        self.started = time.monotonic()
+        self.wakeups = 0
+        self.calls = 0  # subscriber callbacks actually run
+        self.skipped = 0  # subscriber callbacks skipped because the widget was hidden
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)  # a coarse timer may land just before the boundary
+        self.timer.timeout.connect(self.fire)
+        self.rearm()
+
+    def subscribe(self, callback, widget=None):
+        self.subscribers[callback] = widget
+
+    def unsubscribe(self, callback):
+        self.subscribers.pop(callback, None)
+
+    def rearm(self):
+        now_ms = int(time.time() * 1000)
+        self.timer.start(self.interval_ms - now_ms % self.interval_ms + CLOCK_MARGIN_MS)
+
+    def fire(self):
+        self.wakeups += 1
+        for callback, widget in list(self.subscribers.items()):
+            if widget is not None and (not widget.isVisible() or widget.window().isMinimized()):
+                self.skipped += 1  # refreshed by the widget itself when it is shown again
+                continue
+            self.calls += 1
+            callback()
+        self.rearm()
+
+    def wakeups_per_second(self):
+        elapsed = time.monotonic() - self.started
+        return self.wakeups / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        return {"wakeups": self.wakeups, "wakeups_per_second": self.wakeups_per_second(),
+                "calls": self.calls, "skipped": self.skipped, "subscribers": len(self.subscribers)}
+
+
+class AudioEngine:
+    # App-wide alarm audio. The mixer is opened once and every sound file decoded once into a cached Sound,
+    # so ringing is just picking a channel. Each alarm plays on its own channel with maxtime as its stop,
+    # so overlapping alarms mix instead of cutting each other off. Without an audio device it stays silent.
+    def __init__(self, channels=AUDIO_CHANNELS):
+        self.channels = channels
+        self.ready = None  # None until the mixer has been tried
+        self.sounds = {}  # path -> decoded pygame.mixer.Sound
+        self.plays = 0
+        self.decodes = 0
+        self.failures = 0
+
+    def start(self):
+        import pygame  # first alarm or sound preload, after the window is up
+        if self.ready is None:
+            try:
+                pygame.mixer.init()
+                pygame.mixer.set_num_channels(self.channels)
+                self.ready = True
+            except pygame.error:
+                self.ready = False
+                # print("No audio device, alarms will be silent")
+        return self.ready
+
+    def sound(self, path):
+        import pygame
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+            self.sounds[path] = sound
+            self.decodes += 1
+        return sound
+
+    def preload(self, paths):
+        # Decode ahead of time so the first alarm doesn't wait for it
+        import pygame
+        if not self.start():
+            return
+        for path in paths:
+            try:
+                self.sound(path)
+            except (pygame.error, OSError):
+                self.failures += 1
+
+    def play(self, path, duration_ms=ALARM_DURATION_MS, fallback=ALARM_SOUND):
+        # The channel the sound plays on, or None if nothing could be played
+        import pygame
+        if not self.start():
+            return None
+        try:
+            sound = self.sound(path)
+        except (pygame.error, OSError):
+            self.failures += 1
+            if not fallback or fallback == path:
+                return None
+            return self.play(fallback, duration_ms, None)  # a missing tab sound still rings alarm.mp3
+        channel = pygame.mixer.find_channel(True)  # all busy: reuse the one playing longest
+        channel.play(sound, maxtime=duration_ms)
+        self.plays += 1
+        return channel
+
+    def stop(self):
+        if self.ready:
+            import pygame
+            pygame.mixer.stop()
+
+    def stats(self):
+        return {"ready": self.ready, "cached_sounds": len(self.sounds), "decodes": self.decodes,
+                "plays": self.plays, "failures": self.failures}
+
+
+shared_audio_engine = None
+
+
+def get_audio_engine():
+    global shared_audio_engine
+    if shared_audio_engine is None:
+        shared_audio_engine = AudioEngine()
+    return shared_audio_engine
+
+
+class AlarmTracker(QObject):
+    # Rings a tab's alarms straight from its store. Needs no table, so unopened tabs use it too.
+    def __init__(self, store, parent=None, sound=None):
+        super().__init__(parent)
+        self.store = store
+        self.sound = sound  # the tab's own alarm sound file; None plays ALARM_SOUND
+        self.stopped = False
+        self.rung_alarms = set()  # keys of entries whose alarm has rung
+        self.alarm_scheduler = AlarmScheduler(self.on_deadline, self)
+        # Same rule as refresh_deadline, for every entry at once
+        timestamps = self.store.timestamps
+        self.alarm_scheduler.update_all([
+            (timestamps[key], key) for key, entry in self.store.entries.items()
+            if entry.get("alarm", False) and not entry["status"] and timestamps.get(key) is not None])
+
+    def can_ring_alarm(self):
+        global last_alarm_time
+        if last_alarm_time is None or datetime.now() - last_alarm_time > COOLDOWN_PERIOD:
+            return True
+        return False
+
+    def refresh_deadline(self, key):
+        # Called whenever an entry's date, status or alarm flag changes
+        entry = self.store.entries.get(key)
+        if entry is None or not entry.get("alarm", False) or entry["status"]:
+            self.alarm_scheduler.discard(key)
+        else:
+            self.alarm_scheduler.update(key, self.store.timestamp(key))  # None ("N/A"/invalid) never rings
+
+    def on_deadline(self, key):
+        if key in self.rung_alarms or key not in self.store.entries:
+            return
+        if not self.can_ring_alarm():
+            # Another alarm rang recently; try again when the cooldown is over
+            self.alarm_scheduler.update(key, last_alarm_time + COOLDOWN_PERIOD + timedelta(seconds=1))
+            return
+        self.trigger_alarm(key)
+
+    def trigger_alarm(self, key):
+        global last_alarm_time
+        last_alarm_time = datetime.now()
+
+        # print(f"Alarm triggered for {self.store.entries[key]['name']}!")
+        alarm_path = self.sound or ALARM_SOUND
+        get_audio_engine().play(alarm_path, ALARM_DURATION_MS)
+
+        self.rung_alarms.add(key)  # Add this entry to the set of rung alarms
+
+        if self.store.entries[key].get("snooze", False):
+            QTimer.singleShot(int(SNOOZE_PERIOD.total_seconds() * 1000), lambda: self.check_snooze(key))
+
+    def stop(self):
+        # The tab is gone: no more deadlines, and pending snoozes find stopped set
+        self.stopped = True
+        self.alarm_scheduler.stop()
+
+    def check_snooze(self, key):
+        if self.stopped:
+            return
+        entry = self.store.entries.get(key)
+        if entry is not None and entry.get("alarm", False) and entry.get("snooze", False):
+            self.rung_alarms.discard(key)  # Remove this entry from rung alarms to allow it to ring again
+            self.trigger_alarm(key)
+
+    def stop_alarm(self, row):
+        get_audio_engine().stop()  # Ensure every alarm channel is stopped
+        # print(f"Alarm stopped for row {row + 1}")
+
+    def check_startup_alarms(self):
+        current_time = datetime.now()
+        for key in self.store.order:
+            if self.store.entries[key].get("alarm", False):
+                date_time = self.store.timestamp(key)
+                if date_time is not None and date_time <= current_time:  # Skips "N/A" and invalid dates
+                    self.trigger_alarm(key)
+                    break  # Only trigger the first expired alarm found
+
+
+class EntryTableModel(QAbstractTableModel):
+    # Table view over an EntryStore. Rows are the store order, or `sorted_keys` while sort mode is on.
+    # Check box and "+1 Week" cells are painted by delegates, so a row costs no widgets.
+    TEXT_FIELDS = ("name", "episode", "datetime")
+    CHECK_FIELDS = ("status", "alarm", "snooze")
+    ROWS_MIME_TYPE = "application/x-schedule-rows"
+
+    entry_changed = Signal(str, str)  # key, field
+    rows_moved = Signal(int, int)  # new first row, row count
+
+    def __init__(self, store, schema, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.schema = schema
+        self.fields = schema.columns  # shared, so added columns show up here
+        self.headers = [schema.header(column) for column in schema.columns]
+        self.sorted_keys = None  # view order while sorting; None means store order
+        self.locked = False  # read-only while sorting
+        self.now = datetime.now()
+        self.fetched = min(FETCH_BATCH_ROWS, len(store))  # rows the view knows about
+        self.countdowns = {}  # key -> countdown text for the rows last refreshed
+        self.sort_index = SortIndex(store)
+
+    def keys(self):
+        return self.sorted_keys if self.sorted_keys is not None else self.store.order
+
+    def key_for_row(self, row):
+        keys = self.keys()
+        return keys[row] if 0 <= row < len(keys) else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else min(self.fetched, len(self.keys()))
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.fetched < len(self.keys())
+
+    def fetchMore(self, parent=QModelIndex()):
+        # Called by the view when it scrolls near the last known row
+        count = min(FETCH_BATCH_ROWS, len(self.keys()) - self.fetched)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.fetched, self.fetched + count - 1)
+        self.fetched += count
+        self.endInsertRows()
+
+    def fetch_row(self, row):
+        # Make sure the view knows about `row`, in one insert rather than batch by batch
+        if row >= self.fetched and row < len(self.keys()):
+            self.beginInsertRows(QModelIndex(), self.fetched, row)
+            self.fetched = row + 1
+            self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.fields)
+
+    def is_text(self, field):
+        return field in self.TEXT_FIELDS or field in self.schema.extra_columns
+
+    def add_column(self, column):
+        if not self.schema.can_add_column(column):
+            return False
+        position = len(self.fields)
+        self.beginInsertColumns(QModelIndex(), position, position)
+        self.schema.add_column(column)
+        self.headers.append(self.schema.header(column))
+        self.endInsertColumns()
+        return True
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal:
+                return self.headers[section]
+            return str(section + 1)
+        return None
+
+    def set_headers(self, headers):
+        self.headers = headers
+        self.headerDataChanged.emit(Qt.Horizontal, 0, len(headers) - 1)
+
+    def countdown_text(self, key):
+        # The date is pre-parsed by the store, no strptime per paint; "Overtime" alarms are the AlarmTracker's job
+        return countdown_text(self.store.entries[key], self.store.timestamp(key), self.now)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self.key_for_row(index.row())
+        field = self.fields[index.column()]
+        entry = self.store.entries[key]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if self.is_text(field):
+                return entry.get(field, "")
+            if field == "countdown" and role == Qt.DisplayRole:
+                text = self.countdowns.get(key)
+                if text is None:  # scrolled into view since the last tick
+                    self.now = datetime.now()
+                    text = self.countdowns[key] = self.countdown_text(key)
+                return text
+            if field in self.CHECK_FIELDS and role == Qt.EditRole:
+                return bool(entry.get(field, False))
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags if self.locked else Qt.ItemIsDropEnabled  # drop between/after rows
+        field = self.fields[index.column()]
+        if self.is_text(field) or field == "countdown":
+            if self.locked:
+                return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+            if field == "countdown":
+                return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsDragEnabled | Qt.ItemIsDropEnabled
+            return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsDragEnabled \
+                | Qt.ItemIsDropEnabled
+        # Check boxes and the "+1 Week" button are disabled while sorting; snooze needs the alarm on
+        entry = self.store.entries[self.key_for_row(index.row())]
+        if self.locked or (field == "snooze" and not entry.get("alarm", False)):
+            return Qt.ItemIsSelectable
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or self.locked:
+            return False
+        field = self.fields[index.column()]
+        if field == "datetime" and value not in ("N/A", "Invalid Date") and parse_date_time(value) is None:
+            value = "Invalid Date"
+        if self.is_text(field):
+            self.set_fields(index.row(), {field: value})
+            return True
+        if field in self.CHECK_FIELDS:
+            changes = {field: bool(value)}
+            if field == "alarm" and not value:
+                changes["snooze"] = False  # no snooze without an alarm
+            self.set_fields(index.row(), changes)
+            return True
+        return False
+
+    def set_fields(self, row, changes):
+        self.set_rows_fields({row: changes})
+
+    def set_rows_fields(self, row_changes):
+        # {row: {field: value}}: all edits go into the store first, then the view gets one update
+        if not row_changes:
+            return
+        changed = []
+        for row, changes in row_changes.items():
+            key = self.key_for_row(row)
+            for field, value in changes.items():
+                self.store.set_field(key, field, value)
+            self.countdowns.pop(key, None)
+            self.sort_index.invalidate(key)
+            changed.append((key, changes))
+        self.dataChanged.emit(self.index(min(row_changes), 0), self.index(max(row_changes), len(self.fields) - 1))
+        for key, changes in changed:
+            for field in changes:
+                self.entry_changed.emit(key, field)
+
+    def append_entry(self, entry):
+        row = len(self.store)
+        if self.fetched < row:
+            return self.store.insert(entry)  # lands after rows the view hasn't fetched yet
+        self.beginInsertRows(QModelIndex(), row, row)
+        key = self.store.insert(entry)
+        self.fetched += 1
+        self.endInsertRows()
+        return key
+
+    def append_entries(self, entries):
+        # Bulk insert: the store takes every entry first, then the view is told once
+        all_fetched = self.fetched >= len(self.store)
+        keys = [self.store.insert(entry) for entry in entries]
+        if keys and all_fetched and self.sorted_keys is None:
+            self.fetchMore()  # the new rows are past `fetched`, so revealing them is one insert
+        return keys
+
+    def remove_rows(self, rows):
+        # One store transaction; a single row is removed in place, a selection in one reset
+        rows = sorted(set(rows))
+        if not rows:
+            return []
+        in_place = len(rows) == 1
+        if in_place and rows[0] < self.fetched:
+            self.beginRemoveRows(QModelIndex(), rows[0], rows[0])
+        elif not in_place:
+            self.beginResetModel()
+        keys = self.store.delete_rows(rows)
+        for key in keys:
+            self.countdowns.pop(key, None)
+            self.sort_index.invalidate(key)
+        if in_place:
+            if rows[0] < self.fetched:
+                self.fetched -= 1
+                self.endRemoveRows()
+        else:
+            self.fetched = min(max(self.fetched - len(keys), FETCH_BATCH_ROWS), len(self.keys()))
+            self.endResetModel()
+        return keys
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def mimeTypes(self):
+        return [self.ROWS_MIME_TYPE]
+
+    def mimeData(self, indexes):
+        rows = sorted({index.row() for index in indexes})
+        data = QMimeData()
+        data.setData(self.ROWS_MIME_TYPE, QByteArray(json.dumps(rows).encode()))
+        return data
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if self.locked or action != Qt.MoveAction or not data.hasFormat(self.ROWS_MIME_TYPE):
+            return False
+        if row == -1:
+            row = parent.row() if parent.isValid() else self.rowCount()  # dropped on a row: insert before it
+        self.move_rows(json.loads(bytes(data.data(self.ROWS_MIME_TYPE)).decode()), row)
+        # Report no drop so the view doesn't also try to remove the dragged rows
+        return False
+
+    def move_rows(self, rows, row_to):
+        # Reorder in place: the store moves the block, the view is told it's a layout change
+        rows = sorted(set(rows))
+        if not rows or self.locked:
+            return
+        while row_to + len(rows) > self.fetched and self.canFetchMore():
+            self.fetchMore()  # the block's new rows must be rows the view knows about
+        saved = self.begin_layout_change()
+        first = self.store.move_rows(rows, row_to)
+        self.end_layout_change(saved)
+        self.rows_moved.emit(first, len(rows))
+
+    def begin_layout_change(self):
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        return persistent, [(self.key_for_row(index.row()), index.column()) for index in persistent]
+
+    def end_layout_change(self, saved):
+        # Point selection/current index at the same entries in their new rows
+        persistent, persistent_keys = saved
+        if self.sorted_keys is None:
+            row_of = {key: self.store.entries[key]["entry_position"] for key, _ in persistent_keys
+                      if key in self.store.entries}
+        else:
+            row_of = {key: row for row, key in enumerate(self.sorted_keys)}
+        self.changePersistentIndexList(persistent, [
+            self.index(row_of[key], column) if key in row_of and row_of[key] < self.fetched else QModelIndex()
+            for key, column in persistent_keys])
+        self.layoutChanged.emit()
+
+    def set_sorted_keys(self, keys):
+        self.beginResetModel()
+        self.sorted_keys = keys
+        self.fetched = min(FETCH_BATCH_ROWS, len(self.keys()))
+        self.countdowns = {}
+        self.endResetModel()
+
+    def set_order(self, keys):
+        # Same rows in a new order (sort mode on/off, sort column changed): a layout change keeps
+        # selection and the view's rows, nothing is reset or re-fetched
+        saved = self.begin_layout_change()
+        self.sorted_keys = keys
+        self.end_layout_change(saved)
+
+    def set_locked(self, locked):
+        self.locked = locked
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, len(self.fields) - 1))
+
+    def refresh_countdowns(self, first, last):
+        # Recalculate rows first..last only and repaint the ones whose text changed.
+        # Rows outside the range drop out of the cache and are recalculated when painted.
+        self.now = datetime.now()
+        column = self.fields.index("countdown")
+        keys = self.keys()
+        countdowns = {}
+        changed_from = None
+        for row in range(max(first, 0), min(last, self.rowCount() - 1) + 1):
+            key = keys[row]
+            text = countdowns[key] = self.countdown_text(key)
+            if text != self.countdowns.get(key):
+                if changed_from is None:
+                    changed_from = row
+            elif changed_from is not None:
+                self.dataChanged.emit(self.index(changed_from, column), self.index(row - 1, column))
+                changed_from = None
+        if changed_from is not None:
+            self.dataChanged.emit(self.index(changed_from, column), self.index(row, column))
+        self.countdowns = countdowns
+
+
+class CheckBoxDelegate(QStyledItemDelegate):
+    # Paints a check box cell (colour fill or on/off pixmap) and toggles it on click
+    def __init__(self, parent=None, checked_color=None, unchecked_color=None, checked_pixmap=None,
+                 unchecked_pixmap=None):
+        super().__init__(parent)
+        self.checked_color = QColor(checked_color) if checked_color else None
+        self.unchecked_color = QColor(unchecked_color) if unchecked_color else None
+        self.checked_pixmap = QPixmap(checked_pixmap) if checked_pixmap else None
+        self.unchecked_pixmap = QPixmap(unchecked_pixmap) if unchecked_pixmap else None
+
+    def paint(self, painter, option, index):
+        checked = index.data(Qt.EditRole)
+        enabled = bool(index.flags() & Qt.ItemIsEnabled)
+        painter.save()
+        if not enabled:
+            painter.setOpacity(0.4)
+        if self.checked_pixmap is not None:
+            pixmap = self.checked_pixmap if checked else self.unchecked_pixmap
+            target = QRect(0, 0, 60, 40)
+            target.moveCenter(option.rect.center())
+            painter.drawPixmap(target, pixmap)
+        else:
+            box = option.rect.adjusted(4, 4, -4, -4)
+            painter.setPen(QColor("#2a3f55"))
+            painter.setBrush(self.checked_color if checked else self.unchecked_color)
+            painter.drawRoundedRect(box, 3, 3)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if not index.flags() & Qt.ItemIsEnabled:
+            return False
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            if option.rect.contains(event.pos()):
+                model.setData(index, not index.data(Qt.EditRole), Qt.EditRole)
+                return True
+        return False
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    # Paints a push button in the cell; clicked(row) replaces a per-row QPushButton.
+    # The label is the cell's display text when the model gives one, `text` otherwise.
+    clicked = Signal(int)
+
+    def __init__(self, text, parent=None):
+        super().__init__(parent)
+        self.text = text
+
+    def paint(self, painter, option, index):
+        enabled = bool(index.flags() & Qt.ItemIsEnabled)
+        painter.save()
+        if not enabled:
+            painter.setOpacity(0.4)
+        box = option.rect.adjusted(3, 3, -3, -3)
+        painter.setPen(QColor("#2a3f55"))
+        painter.setBrush(QColor("#1c2936"))
+        painter.drawRoundedRect(box, 5, 5)
+        painter.setPen(QColor("#00ffff"))
+        painter.drawText(box, Qt.AlignCenter, index.data(Qt.DisplayRole) or self.text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if not index.flags() & Qt.ItemIsEnabled:
+            return False
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            if option.rect.contains(event.pos()):
+                self.clicked.emit(index.row())
+                return True
+        return False
+
+
+class SearchResultModel(QAbstractTableModel):
+    # Torrent search results, most seeders first, filled batch by batch while the feed downloads.
+    # Keeps at most `limit` rows; the last column is painted as a "Download" button by a ButtonDelegate,
+    # labelled with the download's progress while one is running.
+    HEADERS = ["Title", "Seeders", "Size", ""]
+    COLORS = {0: QColor("white"), 1: QColor("skyblue"), 2: QColor("red")}
+
+    def __init__(self, limit=NYAA_TOP_RESULTS, parent=None):
+        super().__init__(parent)
+        self.limit = limit
+        self.items = []  # (title, link, seeders, size)
+        self.ranks = []  # -seeders per row, for bisect
+        self.download_states = {}  # link -> button label ("Queued", "42%", "Done"...)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        title, link, seeders, size = self.items[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return (title, str(seeders), size, self.download_states.get(link))[column]
+        if role == Qt.ForegroundRole:
+            return self.COLORS.get(column)
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled if index.isValid() else Qt.NoItemFlags
+
+    def add_items(self, items):
+        # Insert each item after the rows with as many seeders, dropping whatever falls past the limit
+        for item in items:
+            row = bisect.bisect_right(self.ranks, -item[2])
+            if row >= self.limit:
+                continue
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.items.insert(row, item)
+            self.ranks.insert(row, -item[2])
+            self.endInsertRows()
+            if len(self.items) > self.limit:
+                last = len(self.items) - 1
+                self.beginRemoveRows(QModelIndex(), last, last)
+                del self.items[last]
+                del self.ranks[last]
+                self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.items = []
+        self.ranks = []
+        self.endResetModel()
+
+    def set_download_state(self, link, state):
+        if state is None:
+            self.download_states.pop(link, None)
+        else:
+            self.download_states[link] = state
+        column = len(self.HEADERS) - 1
+        for row, item in enumerate(self.items):
+            if item[1] == link:
+                self.dataChanged.emit(self.index(row, column), self.index(row, column))
+
+
+class TabPlaceholder(QWidget):
+    # Stands in for a ScheduleApp until its tab is first opened. Only the entries are loaded,
+    # so alarms keep ringing; the table, inputs and timers are built by MainApp.open_tab.
+    def __init__(self, filename, storage, schema, sound=None):
+        super().__init__()
+        self.filename = filename
+        self.schema = schema
+        self.store = storage.open_store(filename)
+        self.alarms = AlarmTracker(self.store, self, sound)
+        self.alarms.check_startup_alarms()
+
+
 class ScheduleApp(QWidget):
-    def __init__(self, filename):
+    def __init__(self, filename, save_scheduler=None, storage=None, store=None, alarms=None, clock=None,
+                 schema=None):
         super().__init__()
         self.filename = filename
-        self.watch_tab = ['anime', 'animes', 'movie', 'movies', 'tv', 'series', 'shows', 'show', 'seasons', ]
-        self.filename_lower = self.filename.lower()
+        self.schema = schema or TabSchema.for_filename(filename)  # column set and name -> index map
+        self.save_scheduler = save_scheduler or SaveScheduler(self)
+        self.clock = clock or AppClock(self)
+        self.storage = storage or JsonStorage()
         # print(f"Initializing ScheduleApp with filename: {self.filename}")  # Debug log
-        self.stop_timer = None
-        self.temp_data = []  # Temporary list for sorting
+        self.sorted_keys = []  # Entry keys in sorted order while sorting
         self.is_sorting = False
+        self.nyaa_search = None  # created with the first torrent popup
+        self.downloads = {}  # download id -> url, for downloads started from this tab's popup
+        self.watching_downloads = False
         self.sort_order = Qt.AscendingOrder
         self.last_sorted_column = None
+        self.sort_columns = []  # [(field, descending)], most significant first
         self.bar_toggle = False
+        # in-memory entries, loaded once (or handed over by the tab's placeholder)
+        self.store = store if store is not None else self.storage.open_store(self.filename)
 
         self.layout = QVBoxLayout(self)
-        self.table = QTableWidget()
-
-        # Set up the table
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
-            self.table.setColumnCount(8)  # Increase column count
-            self.table.setHorizontalHeaderLabels(
-                ["Name", "Episode", "Date and Time", "Countdown", "Status", "Alarm", "Snooze",
-                 "Next"])  # Add new header
-        else:
-            self.table.setColumnCount(6)
-            self.table.setHorizontalHeaderLabels(
-                ["Name", "Date and Time", "Countdown", "Status", "Alarm", "Snooze"])  # Add new header
+        self.table = QTableView()
+
+        # Set up the table; the model reads straight from the store
+        self.model = EntryTableModel(self.store, self.schema, self)
+        self.model.entry_changed.connect(self.on_entry_changed)  # ensures saving; name, episode, date, check boxes
+        self.model.rows_moved.connect(self.on_rows_moved)  # move up/down and drag-and-drop
+        self.table.setModel(self.model)
+
+        # Check boxes and "+1 Week" are painted by delegates instead of per-row widgets
+        self.status_delegate = CheckBoxDelegate(self, checked_color="#00ffff", unchecked_color="#1c2936")
+        self.alarm_delegate = CheckBoxDelegate(self, checked_pixmap="on.png", unchecked_pixmap="off.png")
+        self.snooze_delegate = CheckBoxDelegate(self, checked_color="green", unchecked_color="#4e4e4e")
+        self.add_a_week_delegate = ButtonDelegate("+1 Week", self)
+        self.add_a_week_delegate.clicked.connect(self.add_a_week_button_clicked)
+        column = self.schema.index
+        self.table.setItemDelegateForColumn(column["status"], self.status_delegate)
+        self.table.setItemDelegateForColumn(column["alarm"], self.alarm_delegate)
+        self.table.setItemDelegateForColumn(column["snooze"], self.snooze_delegate)
+        if self.schema.watch:
+            self.table.setItemDelegateForColumn(column["next"], self.add_a_week_delegate)
 
         header = self.table.horizontalHeader()
 
         header.setStyleSheet("font-weight: bold;")
         # Set column widths
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
-            self.table.setColumnWidth(1, 140)  # Countdown column width
-            self.table.setColumnWidth(3, 155)  # Countdown column width
-            self.table.setColumnWidth(4, 100)  # Status column width
-            self.table.setColumnWidth(5, 70)  # Alarm column width
-            self.table.setColumnWidth(6, 75)  # Snooze column width
-            self.table.setColumnWidth(7, 100)  # Add A Week column width
-        else:
-            self.table.setColumnWidth(2, 150)  # Countdown column width
-            self.table.setColumnWidth(3, 100)  # Status column width
-            self.table.setColumnWidth(4, 70)  # Alarm column width
-            self.table.setColumnWidth(5, 75)  # Snooze column width
-
-        # Set stretch mode for the first two columns (Name and Date and Time)
-
-        header.setSectionResizeMode(0, QHeaderView.Stretch)
-        # Set fixed mode for the last three columns (Countdown, Status, Alarm, Snooze)
-        header.setSectionResizeMode(3, QHeaderView.Fixed)
-        header.setSectionResizeMode(4, QHeaderView.Fixed)
-        header.setSectionResizeMode(5, QHeaderView.Fixed)
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
-            header.setSectionResizeMode(6, QHeaderView.Fixed)
-            header.setSectionResizeMode(1, QHeaderView.Fixed)
-            header.setSectionResizeMode(2, QHeaderView.Stretch)
-        else:
-            header.setSectionResizeMode(1, QHeaderView.Stretch)
-            header.setSectionResizeMode(2, QHeaderView.Fixed)
+        if self.schema.watch:
+            self.table.setColumnWidth(column["episode"], 140)  # Episode column width
+            self.table.setColumnWidth(column["next"], 100)  # Add A Week column width
+        self.table.setColumnWidth(column["countdown"], 155 if self.schema.watch else 150)  # Countdown column width
+        self.table.setColumnWidth(column["status"], 100)  # Status column width
+        self.table.setColumnWidth(column["alarm"], 70)  # Alarm column width
+        self.table.setColumnWidth(column["snooze"], 75)  # Snooze column width
+
+        # Set stretch mode for Name and Date and Time
+        header.setSectionResizeMode(column["name"], QHeaderView.Stretch)
+        header.setSectionResizeMode(column["datetime"], QHeaderView.Stretch)
+        # Set fixed mode for Episode, Countdown, Status, Alarm, Snooze
+        for fixed_column in ("episode", "countdown", "status", "alarm", "snooze"):
+            if fixed_column in column:
+                header.setSectionResizeMode(column[fixed_column], QHeaderView.Fixed)
 
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setEditTriggers(QAbstractItemView.DoubleClicked)
-        self.table.itemChanged.connect(self.on_item_changed)  # ensures saving immediately; name, episode, date
+        # Drag selected rows to reorder them
+        self.table.setDragEnabled(True)
+        self.table.setAcceptDrops(True)
+        self.table.setDropIndicatorShown(True)
+        self.table.setDragDropOverwriteMode(False)
+        self.table.setDragDropMode(QAbstractItemView.InternalMove)
 
         self.layout.addWidget(self.table)
 
@@ -303,7 +1233,7 @@ class ScheduleApp(QWidget):
         self.move_down_button.hide()
 
 
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
+        if self.schema.watch:
             self.column_input.setText("3,4,5,6,7")
         else:
             self.column_input.setText("2,3,4,5")  # default column numbers
@@ -322,16 +1252,19 @@ class ScheduleApp(QWidget):
         self.visibility_off_button.setFixedWidth(100)  # Set width to 100 pixels
         self.bottom_bar.setFixedWidth(25)  # Set width to 100 pixels
 
-        self.rung_alarms = set()  # New attribute to track rung alarms
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_countdown)
-        self.timer.start(1000)  # Update every second
+        self.clock.subscribe(self.update_countdown, self)  # skipped while the tab is hidden
 
         # stylesheet
         self.setStyleSheet(table_styling_data)
 
         self.load_data()
-        self.check_startup_alarms()
+        if alarms is None:
+            self.alarms = AlarmTracker(self.store, self)
+            self.alarms.check_startup_alarms()
+        else:
+            # Already tracking (and has done the startup check) since the tab was loaded
+            self.alarms = alarms
+            self.alarms.setParent(self)
         # print("ScheduleApp initialization complete")  # Debug log
 
     def bottom_bar_toggle(self):
@@ -353,40 +1286,24 @@ class ScheduleApp(QWidget):
             self.move_down_button.show()
 
     def add_a_week_button_clicked(self, clicked_row):
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
+        if self.schema.watch:
             if not self.is_sorting:
-                episode_data = self.table.item(clicked_row, 1)  # Episode
-                episode_text = episode_data.text()
-                datetime_item = self.table.item(clicked_row, 2)  # Get the datetime item
-                datetime_str = datetime_item.text()  # if string is "N/A", do nothing
-                status_check = self.table.cellWidget(clicked_row, 4).isChecked()  # status
-
-                # print(f"Week Button Clicked")  # Debug log
-
-                if status_check == 0:
-                    pass
-                    # print(f"Can't; status not checked = Status is: {status_check}")  # Debug log
-                elif status_check != 0:
-
-                    number_match = re.search(r'E-(\d+)', episode_text)  # finding episode number
-                    if number_match:  # if episode number format is found [S01 E01]
-                        # Convert the datetime string to a datetime object
-                        date_time = datetime.strptime(datetime_str, "%d %b %Y %H:%M")
-                        # Add a week to the datetime object
-                        new_date_time = date_time + timedelta(weeks=1)
-                        # Convert the new datetime object back to a string
-                        new_date_time_str = new_date_time.strftime("%d %b %Y %H:%M")
-                        # Set the new datetime string to the datetime item
-                        datetime_item.setText(new_date_time_str)
-                        self.table.cellWidget(clicked_row, 4).setChecked(False)  # Uncheck the status checkbox
-
-                        # Convert to an integer and increment by 1
-                        episode_number = int(number_match.group(1)) + 1
-                        # Create the new episode string
-                        new_episode = re.sub(r'E-\d+', f'E-{episode_number:02}', episode_text)
-                        episode_data.setText(new_episode)
-
-                        self.save_data()
+                self.add_a_week([clicked_row])
+
+    def add_a_week(self, rows):
+        # New date, next episode and unchecked status for every row that qualifies, in one update
+        row_changes = {}
+        for row in rows:
+            changes = self.next_week_changes(self.key_for_row(row))
+            if changes:
+                row_changes[row] = changes
+        self.model.set_rows_fields(row_changes)
+
+    def next_week_changes(self, key):
+        if key is None:
+            return None
+        # print(f"Week Button Clicked")  # Debug log
+        return next_week_changes(self.store.entries[key], self.store.timestamp(key))
 
     def update_time_input(self):
         current_time = QTime.currentTime()
@@ -398,51 +1315,33 @@ class ScheduleApp(QWidget):
         self.am_pm_input.setCurrentText("PM" if current_time.hour() >= 12 else "AM")
 
     def update_header_labels(self):
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
-            headers = ["Name", "Episode", "Date and Time", "Countdown", "Status", "Alarm", "Snooze", "Add A Week"]
-        else:
-            headers = ["Name", "Date and Time", "Countdown", "Status", "Alarm", "Snooze"]
+        headers = [self.schema.header(column) for column in self.schema.columns]
         if self.is_sorting and self.last_sorted_column is not None:
             arrow = " ↑" if self.sort_order == Qt.AscendingOrder else " ↓"
             headers[self.last_sorted_column] += arrow
-            for row in range(self.table.rowCount()):
-                if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                    self.table.cellWidget(row, 4).setEnabled(False)  # Status checkbox
-                    self.table.cellWidget(row, 5).setEnabled(False)  # Alarm checkbox
-                    self.table.cellWidget(row, 6).setEnabled(False)  # Snooze checkbox
-                    self.table.cellWidget(row, 7).setEnabled(False)  # Add a Week checkbox
-                else:
-                    self.table.cellWidget(row, 3).setEnabled(False)  # Status checkbox
-                    self.table.cellWidget(row, 4).setEnabled(False)  # Alarm checkbox
-                    self.table.cellWidget(row, 5).setEnabled(False)  # Snooze checkbox
-        self.table.setHorizontalHeaderLabels(headers)
-
-    def on_item_changed(self, item):
-        if not self.is_sorting:
-            row = item.row()
-            column = item.column()
-            if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                date_col_no = 2
-            else:
-                date_col_no = 1
-
-            if column == date_col_no:  # Date and Time column
-                date_time_str = item.text()
-                if date_time_str != "N/A":
-                    try:
-                        datetime.strptime(date_time_str, "%d %b %Y %H:%M")
-                    except ValueError:
-                        # print(ValueError)
-                        item.setText("Invalid Date")
-
-            self.save_data()  # Save immediately after any change
-        else:
-            pass
-            # print("Sorting is active. Changes are not saved.")
+        self.model.set_headers(headers)
+
+    def add_column(self, column):
+        # User-defined text column; values live in each entry under the column name
+        if not self.model.add_column(column):
+            return False
+        self.update_header_labels()
+        return True
+
+    def on_entry_changed(self, key, field):
+        # The model already validated and stored the change
+        if field == "datetime":
+            self.alarms.rung_alarms.discard(key)  # a new date can ring again
+        if field in ("datetime", "status", "alarm"):
+            self.alarms.refresh_deadline(key)
+        self.save_data()  # Save after any change
 
     # --------------------- Sorting ---------------------
     def on_header_clicked(self, logical_index):
         if self.is_sorting:
+            field = self.model.fields[logical_index]
+            if field not in SortIndex.FIELDS:
+                return
             if self.last_sorted_column == logical_index:
                 self.sort_order = Qt.DescendingOrder if self.sort_order == Qt.AscendingOrder else Qt.AscendingOrder
             else:
@@ -452,47 +1351,34 @@ class ScheduleApp(QWidget):
 
             reverse_order = (self.sort_order == Qt.DescendingOrder)
 
-            if logical_index == 0:  # Sort by name
-                self.temp_data.sort(key=lambda x: x['name'].lower(), reverse=reverse_order)
-            elif logical_index == 1 or (logical_index == 2 and "TV" in self.filename):  # Sort by date and time
-                self.temp_data.sort(key=lambda x: self.date_time_sort_key(x['datetime']), reverse=reverse_order)
+            # The clicked column leads; earlier sort columns break ties
+            self.sort_columns = [(field, reverse_order)] + [column for column in self.sort_columns
+                                                            if column[0] != field]
+            del self.sort_columns[MAX_SORT_KEYS:]
+            self.sorted_keys = self.model.sort_index.ordered(self.store.order, self.sort_columns)
 
             self.update_table_display()
             self.update_header_labels()
 
-    def sort_temp_data(self, column):
-        reverse_order = (self.sort_order == Qt.DescendingOrder)
-        if column == 0:  # Sort by name
-            self.temp_data.sort(key=lambda x: x['name'].lower(), reverse=reverse_order)
-        elif column == 1 or (column == 2 and "TV" in self.filename):  # Sort by datetime
-            self.temp_data.sort(key=lambda x: self.date_time_sort_key(x['datetime']), reverse=reverse_order)
-        else:
-            self.temp_data.sort(key=lambda x: x['entry_position'], reverse=reverse_order)
-
-    def date_time_sort_key(self, date_time_str):
-        if date_time_str == "N/A":
-            return datetime.max  # Put "N/A" at the end when sorting
-        try:
-            return datetime.strptime(date_time_str, "%d %b %Y %H:%M")
-        except ValueError:
-            return datetime.max  # Put invalid dates at the end when sorting
+    def key_for_row(self, row):
+        # Table rows follow sorted_keys while sorting, the store order otherwise
+        return self.model.key_for_row(row)
 
     def toggle_sort(self):
         self.is_sorting = not self.is_sorting
         if self.is_sorting:
-            # Load all data into temp_data when sort is toggled on
-            data = self.load_data_into_dict()
-            self.temp_data = [{'key': k, **v} for k, v in data.items()]
+            # Start from the current order when sort is toggled on
+            self.sorted_keys = list(self.store.order)
             self.sort_order = Qt.AscendingOrder
             self.last_sorted_column = None
+            self.sort_columns = []
             self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         else:
-            # Clear temp_data when toggled off
-            self.temp_data = []
+            # Clear sorted_keys when toggled off
+            self.sorted_keys = []
             self.last_sorted_column = None
+            self.sort_columns = []
             self.table.setEditTriggers(QAbstractItemView.DoubleClicked)
-            # Reload data from file without adding new rows
-            self.reload_data_from_file()
 
         self.update_table_display()
         self.update_header_labels()
@@ -501,57 +1387,18 @@ class ScheduleApp(QWidget):
         self.move_down_button.setEnabled(not self.is_sorting)
         self.add_button.setEnabled(not self.is_sorting)
 
-        # Enable/disable widgets based on sorting state
-        for row in range(self.table.rowCount()):
-            if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                self.table.cellWidget(row, 4).setEnabled(not self.is_sorting)  # Status
-                self.table.cellWidget(row, 5).setEnabled(not self.is_sorting)  # Alarm
-                self.table.cellWidget(row, 6).setDisabled(self.is_sorting)  # Snooze
-                self.table.cellWidget(row, 7).setEnabled(not self.is_sorting)  # Add A Week
-            else:
-                self.table.cellWidget(row, 3).setEnabled(not self.is_sorting)  # Status
-                self.table.cellWidget(row, 4).setEnabled(not self.is_sorting)  # Alarm
-                self.table.cellWidget(row, 5).setDisabled(self.is_sorting)  # Snooze
-    def reload_data_from_file(self):
-        self.table.setRowCount(0)  # Clear the table
-        self.load_data()  # Use the existing load_data method to reload
+        # Check boxes and "+1 Week" are disabled while sorting
+        self.model.set_locked(self.is_sorting)
 
     def update_table_display(self):
         # print("update_table_display() called")  # Debug log
-        self.table.setRowCount(0)  # Clear the table
-
-        data_to_display = self.temp_data if self.is_sorting else self.load_data_into_dict().values()
-
-        for item in data_to_display:
-            if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                self.add_table_row(
-                    name=item['name'],
-                    episode=item['episode'],
-                    date_time=item['datetime'],
-                    status=item['status'],
-                    alarm=item.get('alarm', False),
-                    snooze=item.get('snooze', False)
-                )
-            else:
-                self.add_table_row(
-                    name=item['name'],
-                    date_time=item['datetime'],
-                    status=item['status'],
-                    alarm=item.get('alarm', False),
-                    snooze=item.get('snooze', False)
-                )
+        # Only the row order changes; the view is permuted, nothing is rebuilt
+        self.model.set_order(list(self.sorted_keys) if self.is_sorting else None)
 
         # Update the header to show sort indicators
         if self.is_sorting and self.last_sorted_column is not None:
             self.table.horizontalHeader().setSortIndicator(self.last_sorted_column, self.sort_order)
 
-    def update_entry_positions(self):
-        data = self.load_data_into_dict()
-        sorted_items = sorted(data.items(), key=lambda x: x[1]['entry_position'])
-        for i, (key, item) in enumerate(sorted_items):
-            item['entry_position'] = i
-        self.save_data_from_dict(data)
-
     def toggle_datetime_input(self, state):
         is_checked = state == Qt.Checked
         self.date_input.setEnabled(not is_checked)
@@ -568,79 +1415,6 @@ class ScheduleApp(QWidget):
             self.update_time_input()
 
     # --------------------- Data ------------------------
-    def add_table_row(self, name, date_time="N/A", status=False, alarm=False, snooze=False,
-                      episode="S01 E-01"):  # change addaweek
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        self.table.setItem(row, 0, QTableWidgetItem(name))
-
-        # Status
-        status_checkbox = QCheckBox()
-        status_checkbox.setChecked(status)
-        status_checkbox.stateChanged.connect(self.save_data())  # Connect the signal here
-
-        status_checkbox.setStyleSheet("""
-            QCheckBox::indicator {
-                width: 100%;
-
-            }
-            QCheckBox::indicator:checked {
-                width: 100%;
-
-        
-            }
-        """)
-
-        # Alarm
-        alarm_checkbox = QCheckBox()
-        alarm_checkbox.setChecked(alarm)
-        alarm_checkbox.stateChanged.connect(
-            lambda state, r=row: self.on_alarm_changed(r, state))  # Connect the signal here
-
-        alarm_checkbox.setStyleSheet(
-            "QCheckBox::indicator:unchecked { background: none; width: 60px; height: 40px; image: url('off.png'); } QCheckBox::indicator:checked { background: none; width: 60px; height: 40px; image: url('on.png'); }")
-
-        # Snooze
-        snooze_checkbox = QCheckBox()
-        snooze_checkbox.setChecked(snooze)
-        snooze_checkbox.setEnabled(alarm)
-        # disable snooze if no alarm
-        snooze_checkbox.stateChanged.connect(
-            lambda state, r=row: self.on_snooze_changed(r, state))  # Connect the signal here
-
-        snooze_checkbox.setStyleSheet("""
-            QCheckBox::indicator {
-                background: #4e4e4e;
-                width: 100%;
-
-            }
-            QCheckBox::indicator:checked {
-                background: green;
-                width: 100%;
-
-
-            }
-        """)
-
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
-            # Add A Week
-            add_a_week_button = QPushButton("+1 Week")  # addaweek
-            add_a_week_button.clicked.connect(
-                lambda r=row: self.add_a_week_button_clicked(r))  # addaweek button clicked
-            self.table.setItem(row, 1, QTableWidgetItem(episode))
-            self.table.setItem(row, 2, QTableWidgetItem(date_time))
-            self.table.setItem(row, 3, QTableWidgetItem("N/A" if date_time == "N/A" else ""))
-            self.table.setCellWidget(row, 4, status_checkbox)
-            self.table.setCellWidget(row, 5, alarm_checkbox)
-            self.table.setCellWidget(row, 6, snooze_checkbox)
-            self.table.setCellWidget(row, 7, add_a_week_button)  # change addaweek
-        else:
-            self.table.setItem(row, 1, QTableWidgetItem(date_time))
-            self.table.setItem(row, 2, QTableWidgetItem("N/A" if date_time == "N/A" else ""))
-            self.table.setCellWidget(row, 3, status_checkbox)
-            self.table.setCellWidget(row, 4, alarm_checkbox)
-            self.table.setCellWidget(row, 5, snooze_checkbox)
-
     def add_entry(self):
         name = self.name_input.text()
         if self.no_date_checkbox.isChecked():
@@ -668,12 +1442,9 @@ class ScheduleApp(QWidget):
                 QMessageBox.warning(self, "Invalid Time", "Please enter a valid time in hh:mm format.")
                 return
         if name:
-            data = self.load_data_into_dict()
-            new_key = str(max(map(int, data.keys())) + 1 if data else 0)
-
-            if any(word.lower() in self.filename_lower for word in self.watch_tab):
+            if self.schema.watch:
                 new_entry = {
-                    "entry_position": len(data),
+                    "entry_position": len(self.store),
                     "name": name,
                     "episode": "S01 E-00",
                     "datetime": date_time,
@@ -684,16 +1455,15 @@ class ScheduleApp(QWidget):
                 }
             else:
                 new_entry = {
-                    "entry_position": len(data),
+                    "entry_position": len(self.store),
                     "name": name,
                     "datetime": date_time,
                     "status": False,
                     "alarm": False,
                     "snooze": False
                 }
-            data[new_key] = new_entry
-            self.save_data_from_dict(data)
-            self.add_table_row(name=name, date_time=date_time, status=False)
+            self.model.append_entry(new_entry)
+            self.save_data()
             self.name_input.clear()
 
             # Update this line to use the new time input method
@@ -701,220 +1471,109 @@ class ScheduleApp(QWidget):
             # Reset date to current date
             self.date_input.setDate(QDate.currentDate())
 
+    def import_entries(self, path):
+        # One store transaction and one view update for the whole file; returns the number added
+        if self.is_sorting:
+            return 0
+        keys = self.model.append_entries(iter_import_entries(path, self.schema))
+        for key in keys:
+            self.alarms.refresh_deadline(key)
+        self.save_data()
+        return len(keys)
+
+    def export_entries(self, path):
+        return export_entries(path, self.store, self.schema)
+
     def load_data(self):
-        try:
-            with open(self.filename, "r") as file:
-                data = json.load(file)
-        except FileNotFoundError:
-            data = {}
-
-        # Sort the data based on the entry_position
-        sorted_data = sorted(data.items(), key=lambda x: x[1]["entry_position"])
-
-        for _, item in sorted_data:
-            alarm_state = item.get('alarm', False)  # Debug log
-            # print(f"Loading alarm state for {item['name']}: {alarm_state}")  # Debug log
-            if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                self.add_table_row(name=item["name"], episode=item["episode"], date_time=item["datetime"],
-                                   status=item["status"], alarm=item.get("alarm", False),
-                                   snooze=item.get("snooze", False))
-            else:
-                self.add_table_row(name=item["name"], date_time=item["datetime"], status=item["status"],
-                                   alarm=item.get("alarm", False),
-                                   snooze=item.get("snooze", False))
+        # The store keeps entries in entry_position order; the view just needs to be told
+        self.model.set_sorted_keys(None)
 
     def save_data(self):
-        if not self.is_sorting:
-            data = {}
-            for row in range(self.table.rowCount()):
-                if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                    name_item = self.table.item(row, 0)
-                    episode_item = self.table.item(row, 1)  # episode
-                    datetime_item = self.table.item(row, 2)
-                    status_widget = self.table.cellWidget(row, 4)
-                    alarm_widget = self.table.cellWidget(row, 5)
-                    snooze_widget = self.table.cellWidget(row, 6)
-                else:
-                    name_item = self.table.item(row, 0)
-                    datetime_item = self.table.item(row, 1)
-                    status_widget = self.table.cellWidget(row, 3)
-                    alarm_widget = self.table.cellWidget(row, 4)
-                    snooze_widget = self.table.cellWidget(row, 5)
-
-                name = name_item.text() if name_item else ""
-                datetime = datetime_item.text() if datetime_item else "N/A"
-                status = status_widget.isChecked() if status_widget else False
-                alarm = alarm_widget.isChecked() if alarm_widget else False
-                snooze = snooze_widget.isChecked() if snooze_widget else False
-
-                # Find the original key for this row
-                original_key = self.find_original_key(row)
-
-                if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                    episode = episode_item.text() if episode_item else ""
-
-                    item = {
-                        "entry_position": row,
-                        "name": name,
-                        "episode": episode,
-                        "datetime": datetime,
-                        "status": status,
-                        "alarm": alarm,
-                        "snooze": snooze
-                    }
-                else:
-                    item = {
-                        "entry_position": row,
-                        "name": name,
-                        "datetime": datetime,
-                        "status": status,
-                        "alarm": alarm,
-                        "snooze": snooze,
-                    }
-                data[original_key] = item
+        # Mark the tab dirty; the scheduler writes it once the burst of edits is over
+        self.save_scheduler.mark_dirty(self)
 
-            try:
-                with open(self.filename, "w") as file:
-                    json.dump(data, file)
-            except IOError as e:
-                pass
-                #print(f"Error saving data: {e}")
+    def prepare_save(self):
+        # Every edit already went through the model into the store
+        return self.store.prepare_save()
 
     def delete_entry(self):
         if not self.is_sorting:
-            current_row = self.table.currentRow()
-            if current_row != -1:  # if a row is selected
-                # Remove row from the table
-                self.table.removeRow(current_row)
-
-                # Load data from the file
-                data = self.load_data_into_dict()
-
-                # Find the key that corresponds to the current row
-                key_to_delete = self.find_key_for_row(current_row, data)
-
-                # Remove the entry from the data
-                if key_to_delete in data:
-                    del data[key_to_delete]
-
-                # Update the entry positions
-                for key, item in data.items():
-                    if item["entry_position"] > current_row:
-                        item["entry_position"] -= 1
-
-                # Save the data to the file
-                self.save_data_from_dict(data)
-
-    def load_data_into_dict(self):
-        try:
-            with open(self.filename, "r") as file:
-                data = json.load(file)
-        except FileNotFoundError:
-            data = {}
-        return data
+            rows = self.selected_rows()
+            if rows:  # if rows are selected
+                # Remove the rows from the view and the store in one go; positions after them shift up
+                scroll = self.table.verticalScrollBar().value()
+                for key in self.model.remove_rows(rows):
+                    self.alarms.alarm_scheduler.discard(key)
+                    self.alarms.rung_alarms.discard(key)
+                self.table.verticalScrollBar().setValue(scroll)
+                self.save_data()
+
+    def mark_complete(self):
+        if not self.is_sorting:
+            self.model.set_rows_fields({row: {"status": True} for row in self.selected_rows()})
 
-    def save_data_from_dict(self, data):
-        try:
-            if not self.is_sorting:
-                with open(self.filename, "w") as file:
-                    json.dump(data, file)
-        except IOError as e:
-            pass
-            #print(f"Error saving data: {e}")
+    def toggle_alarm(self):
+        # Turn the alarm on for the whole selection unless it is already on for all of it
+        if not self.is_sorting:
+            rows = self.selected_rows()
+            alarm = not all(self.store.entries[self.key_for_row(row)].get("alarm", False) for row in rows)
+            changes = {"alarm": True} if alarm else {"alarm": False, "snooze": False}
+            self.model.set_rows_fields({row: dict(changes) for row in rows})
 
     # --------------------- Popup ------------------------
     def download_file(self, url, name):
-        response = requests.get(url)
-        if response.status_code == 200:
-            # Ensure the "Torrent" folder exists
-            loaded_folder_path = os.path.join(os.getcwd(), "Torrent")
-            if not os.path.exists(loaded_folder_path):
-                os.makedirs(loaded_folder_path)
-            url_name = os.path.basename(url)
-            full_name = name + '_' + url_name
-            filename = os.path.join(loaded_folder_path, full_name)
-
-            if not os.path.exists(filename):
-                with open(filename, 'wb') as file:
-                    file.write(response.content)
-                QMessageBox.information(None, "Download", f"Downloaded: {full_name}")
-                os.startfile(filename)  # Open the file with its default application
-            else:
-                os.startfile(filename)  # Open the file with its default application
-                QMessageBox.information(None, "Already Downloaded", f"Exist as: {full_name}")
-
-        else:
-            QMessageBox.critical(None, "Error", f"Failed to download: {url}")
-
-    def parse_and_create_buttons(self, url, layout):
-        try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-        except requests.RequestException as e:
-            QMessageBox.critical(None, "Error", f"Failed to fetch XML from: {url}\n{e}")
-            return
-
-        try:
-            xml_content = response.content
-            root = ET.fromstring(xml_content)
-            namespace = {'nyaa': 'https://nyaa.si/xmlns/nyaa'}
-        except ET.ParseError as e:
-            QMessageBox.critical(None, "Error", f"Failed to parse XML content\n{e}")
+        # Queued in the background; progress shows on the result's button, which cancels while it runs
+        filename = torrent_path(url, name)
+        manager = get_download_manager()
+        if not self.watching_downloads:
+            self.watching_downloads = True
+            manager.progress.connect(self.on_download_progress)
+            manager.finished.connect(self.on_download_finished)
+            manager.failed.connect(self.on_download_failed)
+            manager.cancelled.connect(self.on_download_cancelled)
+        download_id = manager.download(url, filename)
+        if download_id is None:
+            os.startfile(filename)  # Open the file with its default application
+            QMessageBox.information(None, "Already Downloaded", f"Exist as: {os.path.basename(filename)}")
             return
+        if download_id not in self.downloads:
+            self.downloads[download_id] = url
+            self.search_results.set_download_state(url, "Queued")
+
+    def download_search_result(self, row):
+        title, link, seeders, size = self.search_results.items[row]
+        for download_id, url in self.downloads.items():
+            if url == link:
+                get_download_manager().cancel(download_id)
+                return
+        self.download_file(link, title)
 
-        # Create a list to store all items
-        items = []
-
-        # Iterate through each item and store in the list
-        for item in root.findall('./channel/item'):
-            title = item.find('title').text
-            link = item.find('link').text
-            seeders = int(item.find('nyaa:seeders', namespace).text)
-            size = item.find('nyaa:size', namespace).text
-            items.append((title, link, seeders, size))
-
-        # Sort items by number of seeders in descending order
-        items.sort(key=lambda x: x[2], reverse=True)
-
-        # Create a grid layout for the table-like display
-        grid_layout = QGridLayout()
-
-        # Create buttons for sorted items
-        for index, (title, link, seeders, size) in enumerate(items):
-            row = index // 3
-            col = index % 3
-
-            item_widget = QWidget()
-            item_layout = QVBoxLayout(item_widget)
-
-            title_label = QLabel(title)
-            title_label.setWordWrap(True)
-            seeders_label = QLabel(f"Seeders: {seeders}")
-            size_label = QLabel(f"Size: {size}")
-            download_button = QPushButton("Download")
-
-            download_button.clicked.connect(partial(self.download_file, link, title_label.text()))
-
-            item_layout.addWidget(title_label)
-            item_layout.addWidget(seeders_label)
-            item_layout.addWidget(size_label)
-            item_layout.addWidget(download_button)
+    def on_download_progress(self, download_id, received, total):
+        if download_id in self.downloads:
+            state = f"{100 * received // total}%" if total else f"{received // 1024} KB"
+            self.search_results.set_download_state(self.downloads[download_id], state)
 
-            title_label.setStyleSheet("font-size: 16px; color: white;")
-            seeders_label.setStyleSheet("color: skyblue;")
-            size_label.setStyleSheet("color: red;")
+    def on_download_finished(self, download_id, filename):
+        if download_id in self.downloads:
+            self.search_results.set_download_state(self.downloads.pop(download_id), "Done")
+            os.startfile(filename)  # Open the file with its default application
 
-            grid_layout.addWidget(item_widget, row, col)
+    def on_download_failed(self, download_id, message):
+        if download_id in self.downloads:
+            self.search_results.set_download_state(self.downloads.pop(download_id), "Failed")
+            self.search_status_label.setText(message)
 
-        # Add the grid layout to the main layout
-        layout.addLayout(grid_layout)
+    def on_download_cancelled(self, download_id):
+        if download_id in self.downloads:
+            self.search_results.set_download_state(self.downloads.pop(download_id), None)
 
     def show_popup(self):
-        current_row = self.table.currentRow()
+        current_row = self.table.currentIndex().row()
 
         if current_row != -1:  # if a row is selected
-            current_entry_name = self.table.item(current_row, 0).text()
-            current_entry_episode = self.table.item(current_row, 1).text()
+            current_entry = self.store.entries[self.key_for_row(current_row)]
+            current_entry_name = current_entry["name"]
+            current_entry_episode = current_entry.get("episode", "")
             episode_simplified = current_entry_episode.replace(" ", "").replace("-", "")
 
             self.popup_dialog = QDialog(self)
@@ -948,11 +1607,29 @@ class ScheduleApp(QWidget):
             self.submitted_text_label = QLabel()
             layout.addWidget(self.submitted_text_label)
 
-            # Create a scroll area for XML content
-            # Create a scroll area for XML content
-            self.scroll_area = QScrollArea()
-            self.scroll_area.setWidgetResizable(True)
-            layout.addWidget(self.scroll_area)
+            self.search_status_label = QLabel()
+            self.search_status_label.setWordWrap(True)
+            layout.addWidget(self.search_status_label)
+
+            # Results fill in as the feed is parsed; one view row per torrent, no widgets per result
+            self.search_results = SearchResultModel(parent=self.popup_dialog)
+            self.results_view = QTableView()
+            self.results_view.setModel(self.search_results)
+            self.results_view.verticalHeader().hide()
+            self.results_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+            self.results_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+            self.results_view.setWordWrap(True)
+            self.results_view.setStyleSheet("font-size: 14px;")
+            download_delegate = ButtonDelegate("Download", self.results_view)
+            download_delegate.clicked.connect(self.download_search_result)
+            self.results_view.setItemDelegateForColumn(3, download_delegate)
+            results_header = self.results_view.horizontalHeader()
+            results_header.setSectionResizeMode(0, QHeaderView.Stretch)
+            results_header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+            results_header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
+            results_header.setSectionResizeMode(3, QHeaderView.Fixed)
+            results_header.resizeSection(3, 110)
+            layout.addWidget(self.results_view)
 
 
             submit_button.clicked.connect(self.display_input_text_in_popup)
@@ -960,6 +1637,15 @@ class ScheduleApp(QWidget):
 
             self.popup_dialog.setLayout(layout)
 
+            # Searches run in the background; a closed dialog doesn't want their results
+            if self.nyaa_search is None:
+                self.nyaa_search = NyaaSearch(self)
+                self.nyaa_search.started.connect(self.on_search_started)
+                self.nyaa_search.batch.connect(self.on_search_batch)
+                self.nyaa_search.finished.connect(self.on_search_finished)
+                self.nyaa_search.failed.connect(self.on_search_failed)
+            self.popup_dialog.finished.connect(self.nyaa_search.cancel)
+
             # Schedule the automatic click of the subsplease button
             QTimer.singleShot(0, subsplease_button.click)
 
@@ -972,164 +1658,71 @@ class ScheduleApp(QWidget):
         input_text = self.input_textbox.text()
         episode_no = self.episode_textbox.text()
         self.submitted_text_label.setText(f"Submitted: {input_text} {episode_no}")
-        print("called")
-
-        # Create a new widget for scroll content
-        new_scroll_content = QWidget()
-        new_scroll_layout = QVBoxLayout(new_scroll_content)
-
-        # Set the new widget as the scroll area's widget
-        self.scroll_area.setWidget(new_scroll_content)
-
-        if poster == "subsplease":
-            if "S01" in episode_no:
-                search_episode = episode_no.replace("S01", "").replace("E", " ")
-            elif not "S01" in episode_no:
-                search_episode = episode_no.replace("S0", "S").replace("E", " ")
-            else:
-                return
-
-            xml_url = f'https://nyaa.si/?page=rss&q={input_text}+1080p+{search_episode}+subsplease&c=0_0&f=0'
-        else:
-            xml_url = f'https://nyaa.si/?page=rss&q={input_text}+1080p&c=0_0&f=0'
-
-        # Fetch and parse XML to create buttons
-        self.parse_and_create_buttons(xml_url, new_scroll_layout)
-
-        # Update the scroll area
-        self.scroll_area.setWidget(new_scroll_content)
-        self.scroll_area.update()
-
-
-    # --------------------- Alarm ------------------------
-    def can_ring_alarm(self):
-        global last_alarm_time
-        if last_alarm_time is None or datetime.now() - last_alarm_time > COOLDOWN_PERIOD:
-            return True
-        return False
-
-    def trigger_alarm(self, row):
-        global last_alarm_time
-        last_alarm_time = datetime.now()
-
-        # print(f"Alarm triggered for row {row + 1}!")
-        alarm_path = "alarm.mp3"
-        alarm_duration = 5  # Duration in seconds
-        self.play_mp3(alarm_path, alarm_duration)
-
-        self.rung_alarms.add(row)  # Add this row to the set of rung alarms
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
-            snooze_widget = self.table.cellWidget(row, 6)
-        else:
-            snooze_widget = self.table.cellWidget(row, 5)
-
-        if snooze_widget.isChecked():
-            QTimer.singleShot(SNOOZE_PERIOD.total_seconds() * 1000, lambda: self.check_snooze(row))
-
-    def check_snooze(self, row):
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
-            alarm_widget = self.table.cellWidget(row, 5)
-            snooze_widget = self.table.cellWidget(row, 6)
-        else:
-            alarm_widget = self.table.cellWidget(row, 4)
-            snooze_widget = self.table.cellWidget(row, 5)
-
-        if alarm_widget.isChecked() and snooze_widget.isChecked():
-            self.rung_alarms.discard(row)  # Remove this row from rung alarms to allow it to ring again
-            self.trigger_alarm(row)
-
-    def update_snooze_state(self, row, state):
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
-            snooze_checkbox = self.table.cellWidget(row, 6)
-        else:
-            snooze_checkbox = self.table.cellWidget(row, 5)
-        snooze_checkbox.setEnabled(state == Qt.Checked)
-        if state != Qt.Checked:
-            snooze_checkbox.setChecked(False)
-
-    def on_alarm_changed(self, row, state):
-        # print(f"Alarm state changed for row {row} to {state}")  # Debug log
-        self.update_snooze_state(row, state)
-        self.save_data()
-
-    def on_snooze_changed(self, row, state):
-        self.save_data()
-
-    def play_mp3(self, file_path, duration):
-        pygame.mixer.init()
-        pygame.mixer.music.load(file_path)
-        pygame.mixer.music.play()
-
-        self.stop_timer = QTimer()
-        self.stop_timer.setSingleShot(True)
-        self.stop_timer.timeout.connect(lambda: pygame.mixer.music.stop())
-        self.stop_timer.start(duration * 1000)
+        # print("called")
+
+        query = nyaa_query(input_text, episode_no, poster)
+        if query is not None:
+            self.nyaa_search.search(query)  # replaces any search still running
+
+    def on_search_started(self, search_id, query):
+        self.search_results.clear()
+        self.search_query = query
+        self.search_status_label.setText(f"Searching for {query}...")
+
+    def on_search_batch(self, search_id, items):
+        if not self.nyaa_search.is_current(search_id):
+            return  # superseded while the batch was queued
+        self.search_results.add_items(items)
+        self.search_status_label.setText(f"Searching for {self.search_query}... "
+                                         f"{self.search_results.rowCount()} results so far")
+
+    def on_search_finished(self, search_id, items):
+        if not self.nyaa_search.is_current(search_id):
+            return
+        self.search_status_label.setText(f"{len(items)} results." if items else "No results.")
 
-    def stop_alarm(self, row):
-        pygame.mixer.music.stop()  # Ensure the music is stopped
-        if any(word.lower() in self.filename_lower for word in self.watch_tab):
-            alarm_item = self.table.item(row, 5)
-        else:
-            alarm_item = self.table.item(row, 4)
-        # print(f"Alarm stopped for row {row + 1}")
+    def on_search_failed(self, search_id, message):
+        if not self.nyaa_search.is_current(search_id):
+            return
+        self.search_status_label.setText(message)
 
-    def check_startup_alarms(self):
-        current_time = datetime.now()
-        for row in range(self.table.rowCount()):
-            if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                date_time_item = self.table.item(row, 2)
-                alarm_widget = self.table.cellWidget(row, 5)
-            else:
-                date_time_item = self.table.item(row, 1)
-                alarm_widget = self.table.cellWidget(row, 4)
-
-            if date_time_item and alarm_widget and alarm_widget.isChecked():
-                date_time_str = date_time_item.text()
-                if date_time_str != "N/A":
-                    try:
-                        date_time = datetime.strptime(date_time_str, "%d %b %Y %H:%M")
-                        if date_time <= current_time:
-                            self.trigger_alarm(row)
-                            break  # Only trigger the first expired alarm found
-                    except ValueError:
-                        pass  # Skip invalid dates
 
     # --------------------- Move Up/Down ------------------------
+    def selected_rows(self):
+        return sorted(index.row() for index in self.table.selectionModel().selectedRows())
+
     def move_row_up(self):
         if not self.is_sorting:
-            current_row = self.table.currentRow()
-            if current_row > 0:
-                self.swap_rows(current_row, current_row - 1)
-                self.table.setCurrentCell(current_row - 1, 0)
-                self.update_entry_positions()
+            rows = self.selected_rows()
+            if rows and rows[0] > 0:
+                self.model.move_rows(rows, rows[0] - 1)
 
     def move_row_down(self):
         if not self.is_sorting:
-            current_row = self.table.currentRow()
-            if current_row < self.table.rowCount() - 1:
-                self.swap_rows(current_row, current_row + 1)
-                self.table.setCurrentCell(current_row + 1, 0)
-                self.update_entry_positions()
-
-    def swap_rows(self, row1, row2):
-        # Load the data from the file
-        data = self.load_data_into_dict()
-
-        # Find the keys that correspond to the given rows
-        key1 = next(key for key, item in data.items() if item["entry_position"] == row1)
-        key2 = next(key for key, item in data.items() if item["entry_position"] == row2)
-
-        # Swap the entry_position of the two rows
-        data[key1]["entry_position"], data[key2]["entry_position"] = data[key2]["entry_position"], data[key1][
-            "entry_position"]
-
-        # Save the data to the file
-        if not self.is_sorting:
-            self.save_data_from_dict(data)
+            rows = self.selected_rows()
+            if rows and rows[-1] < len(self.store) - 1:
+                self.model.move_rows(rows, rows[-1] + 2)
+
+    def on_rows_moved(self, first, count):
+        # Keep the moved block selected; one save covers the whole move
+        selection = QItemSelection(self.model.index(first, 0),
+                                   self.model.index(first + count - 1, self.model.columnCount() - 1))
+        self.table.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+        self.table.selectionModel().setCurrentIndex(self.model.index(first, 0), QItemSelectionModel.NoUpdate)
+        self.save_data()
 
-        # Reload the data into the table
-        self.table.setRowCount(0)  # Clear the table
-        self.load_data()  # Load the data
+    def reveal_entry(self, key):
+        # Select the entry's row and scroll it into view (used by the global search)
+        try:
+            row = self.model.keys().index(key)
+        except ValueError:
+            return False  # deleted since the search ran
+        self.model.fetch_row(row)
+        index = self.model.index(row, 0)
+        self.table.selectRow(row)
+        self.table.scrollTo(index, QAbstractItemView.PositionAtCenter)
+        self.table.setFocus()
+        return True
 
     # --------------------- Styling ------------------------
     def set_line_edit_style(self):
@@ -1156,70 +1749,51 @@ class ScheduleApp(QWidget):
             delete_action = context_menu.addAction("Delete Entry")
             delete_action.triggered.connect(self.delete_entry)
 
-            if any(word.lower() in self.filename_lower for word in self.watch_tab):
+            # Bulk options, applied to every selected row
+            complete_action = context_menu.addAction("Mark Complete")
+            complete_action.triggered.connect(self.mark_complete)
+            alarm_action = context_menu.addAction("Toggle Alarm")
+            alarm_action.triggered.connect(self.toggle_alarm)
+
+            if self.schema.watch:
+                add_a_week_action = context_menu.addAction("+1 Week")
+                add_a_week_action.triggered.connect(lambda: self.add_a_week(self.selected_rows()))
+
                 # popup option
                 popup_action = context_menu.addAction("Show Torrent")
                 popup_action.triggered.connect(self.show_popup)
 
             context_menu.exec_(event.globalPos())
 
-    def update_countdown(self):
-        global last_alarm_time
-        current_time = datetime.now()
-
-        for row in range(self.table.rowCount()):
-            if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                date_time_item = self.table.item(row, 2)
-                status_widget = self.table.cellWidget(row, 4)
-                alarm_widget = self.table.cellWidget(row, 5)
-            else:
-                date_time_item = self.table.item(row, 1)
-                status_widget = self.table.cellWidget(row, 3)
-                alarm_widget = self.table.cellWidget(row, 4)
-
-            if date_time_item is None or status_widget is None or alarm_widget is None:
-                continue
-
-            date_time_str = date_time_item.text()
-
-            if date_time_str != "N/A":
-                try:
-                    date_time = datetime.strptime(date_time_str, "%d %b %Y %H:%M")
-                    remaining = date_time - current_time
-                    if status_widget.isChecked():
-                        countdown = "Completed"
-                    elif remaining.total_seconds() > 0:
-                        countdown = f"{remaining.days} d : {remaining.seconds // 3600:02d} h : {(remaining.seconds % 3600) // 60:02d} m"
-                    else:
-                        countdown = "Overtime"
-                        if alarm_widget.isChecked() and self.can_ring_alarm() and row not in self.rung_alarms:
-                            self.trigger_alarm(row)
-                except ValueError:
-                    # print("Error")
-                    # print(ValueError)
-                    countdown = "Invalid Date"
-            else:
-                countdown = "N/A"
+    def showEvent(self, event):
+        # Ticks are skipped while hidden, so catch up as soon as the tab is on screen
+        super().showEvent(event)
+        self.update_countdown()
 
-            if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                countdown_item = self.table.item(row, 3)
-            else:
-                countdown_item = self.table.item(row, 2)
-
-            if countdown_item is None:
-                countdown_item = QTableWidgetItem()
-                if any(word.lower() in self.filename_lower for word in self.watch_tab):
-                    self.table.setItem(row, 3, countdown_item)
-                else:
-                    self.table.setItem(row, 2, countdown_item)
-            countdown_item.setText(countdown)
+    def update_countdown(self):
+        # Only the rows in the viewport (plus a small buffer) are recalculated; off-screen
+        # entries are still watched for alarms by the AlarmTracker, which needs no view at all
+        first, last = self.visible_rows()
+        self.model.refresh_countdowns(first - COUNTDOWN_BUFFER_ROWS, last + COUNTDOWN_BUFFER_ROWS)
+
+    def visible_rows(self):
+        row_count = self.model.rowCount()
+        if row_count == 0:
+            return 0, -1
+        first = self.table.rowAt(0)
+        last = self.table.rowAt(self.table.viewport().height() - 1)
+        if first == -1:
+            first = 0
+        if last == -1:  # the rows end above the bottom of the viewport
+            last = row_count - 1
+        return first, last
 
     def visibility_on(self):
         column_numbers = self.column_input.text().split(',')
         for column_number in column_numbers:
             try:
                 column_number = int(column_number)
-                if 0 <= column_number < self.table.columnCount():
+                if 0 <= column_number < self.model.columnCount():
                     self.table.setColumnHidden(column_number, False)
             except ValueError:
                 pass  # Ignore invalid input
@@ -1229,29 +1803,57 @@ class ScheduleApp(QWidget):
         for column_number in column_numbers:
             try:
                 column_number = int(column_number)
-                if 0 <= column_number < self.table.columnCount():
+                if 0 <= column_number < self.model.columnCount():
                     self.table.setColumnHidden(column_number, True)
             except ValueError:
                 pass  # Ignore invalid input
 
-    def find_original_key(self, row):
-        # This method finds the original key for a given row
-        try:
-            with open(self.filename, "r") as file:
-                data = json.load(file)
-            for key, item in data.items():
-                if item["entry_position"] == row:
-                    return key
-        except FileNotFoundError:
-            pass
-        # If not found or file doesn't exist, create a new key
-        return str(max(map(int, data.keys())) + 1 if data else 0)
-
-    def find_key_for_row(self, row, data):
-        sorted_data = sorted(data.items(), key=lambda x: x[1]['entry_position'])
-        if 0 <= row < len(sorted_data):
-            return sorted_data[row][0]
-        return None
+
+class StartupReport:
+    # Wall-clock phases of a cold start, each measured from the end of the previous one. The clock starts
+    # at the first line of main.py, so "imports" covers loading Qt and this module.
+    def __init__(self, started=STARTUP_STARTED):
+        self.started = started
+        self.last = started
+        self.phases = []  # (phase, ms spent in it, ms since launch)
+        self.finished = False
+
+    def mark(self, phase):
+        if self.finished:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, 1000 * (now - self.last), 1000 * (now - self.started)))
+        self.last = now
+
+    def total_ms(self):
+        return 1000 * (self.last - self.started)
+
+    def to_dict(self):
+        return {"phases": [{"phase": phase, "ms": round(spent, 1), "at_ms": round(at, 1)}
+                           for phase, spent, at in self.phases],
+                "total_ms": round(self.total_ms(), 1)}
+
+    def text(self):
+        lines = ["Startup report"]
+        for phase, spent, at in self.phases:
+            lines.append(f"  {phase:<32} {spent:8.1f} ms   (at {at:8.1f} ms)")
+        lines.append(f"  {'launch to interactive':<32} {self.total_ms():8.1f} ms")
+        return "\n".join(lines)
+
+    def finish(self, destination=STARTUP_REPORT):
+        self.finished = True
+        if destination == "1":
+            print(self.text())
+        elif destination:
+            try:
+                with open(destination, "w") as file:
+                    json.dump(self.to_dict(), file, indent=2)
+            except IOError:
+                pass
+                # print(f"Could not write the startup report to {destination}")
+
+
+startup_report = StartupReport()
 
 
 class MainApp(QMainWindow):
@@ -1264,6 +1866,12 @@ class MainApp(QMainWindow):
         if not os.path.exists("Data"):
             os.makedirs("Data")
 
+        # Shared by all tabs: batches edits into one write per tab, off the GUI thread
+        self.save_scheduler = SaveScheduler(self)
+        self.storage = open_storage()
+        self.clock = AppClock(self)  # drives every tab's countdown
+        self.loading_tabs = False
+
         # Set application icon
         self.setWindowIcon(QIcon('app.ico'))
 
@@ -1286,14 +1894,39 @@ class MainApp(QMainWindow):
 
         self.tab_widget.currentChanged.connect(self.on_tab_changed)
 
+        # Global search over the entry names of every tab. Each tab's entries are indexed in slices from
+        # an idle timer, so a startup with many large tabs doesn't freeze on the first key press.
+        self.name_index = NameIndex()
+        self.index_timer = QTimer(self)
+        self.index_timer.setInterval(0)  # runs when the event queue is empty
+        self.index_timer.timeout.connect(self.index_some_entries)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search all tabs...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.on_search_text_changed)
+        self.search_box.returnPressed.connect(self.jump_to_first_result)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(GLOBAL_SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.run_global_search)
+        self.global_results = QListWidget()
+        self.global_results.setMaximumHeight(200)
+        self.global_results.hide()
+        self.global_results.itemActivated.connect(self.jump_to_result)
+        self.global_results.itemClicked.connect(self.jump_to_result)
+
         # Add widgets to layout
         self.central_layout.addWidget(self.title_bar)
+        self.central_layout.addWidget(self.search_box)
+        self.central_layout.addWidget(self.global_results)
         self.central_layout.addWidget(self.tab_widget)
 
         self.setCentralWidget(self.central_widget)
         self.setStyleSheet(outer_layer_styling)
 
-        self.load_tabs()
+        # Tabs are loaded once the empty window has painted (see paintEvent), so it shows up right away
+        self.tabs_loaded = False
+        self.first_paint_done = False
 
         # Create a system tray icon
         self.tray_icon = QSystemTrayIcon(self)
@@ -1306,6 +1939,23 @@ class MainApp(QMainWindow):
         restore_action.triggered.connect(self.showNormal)
         self.tray_menu.addAction(restore_action)
         self.tray_icon.setContextMenu(self.tray_menu)
+        startup_report.mark("main window")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            startup_report.mark("first paint")
+            QTimer.singleShot(0, self.finish_startup)  # after this paint reaches the screen
+
+    def finish_startup(self):
+        if self.tabs_loaded:
+            return
+        self.tabs_loaded = True
+        self.load_tabs()
+        startup_report.mark("interactive")
+        startup_report.finish()
+        QTimer.singleShot(0, self.preload_sounds)
 
     def show_tab_context_menu(self, position):
         index = self.tab_widget.tabBar().tabAt(position)
@@ -1314,6 +1964,18 @@ class MainApp(QMainWindow):
             rename_action = QAction("Rename", self)
             context_menu.addAction(rename_action)
             rename_action.triggered.connect(lambda: self.rename_current_tab(index))
+            add_column_action = QAction("Add Column", self)
+            context_menu.addAction(add_column_action)
+            add_column_action.triggered.connect(lambda: self.add_column_to_tab(index))
+            import_action = QAction("Import...", self)
+            context_menu.addAction(import_action)
+            import_action.triggered.connect(lambda: self.import_into_tab(index))
+            export_action = QAction("Export...", self)
+            context_menu.addAction(export_action)
+            export_action.triggered.connect(lambda: self.export_tab(index))
+            sound_action = QAction("Alarm Sound...", self)
+            context_menu.addAction(sound_action)
+            sound_action.triggered.connect(lambda: self.choose_tab_sound(index))
             context_menu.exec_(self.tab_widget.mapToGlobal(position))
 
     # Rename current tab
@@ -1327,17 +1989,107 @@ class MainApp(QMainWindow):
                 self.tab_widget.setTabText(current_index, new_tab_name)
                 self.save_tabs()
 
+    def add_column_to_tab(self, index):
+        column, ok = QInputDialog.getText(self, "Add Column", "Column name:")
+        column = column.strip()
+        if ok and column:
+            self.open_tab(index)
+            tab = self.tab_widget.widget(index)
+            problem = tab.schema.column_problem(column)
+            if problem is None and tab.add_column(column):
+                self.save_tabs()
+            else:
+                QMessageBox.warning(self, "Add Column", problem or f"Could not add the column '{column}'.")
+
+    def import_into_tab(self, index):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Entries", "", IMPORT_EXPORT_FILTER)
+        if not path:
+            return
+        self.open_tab(index)
+        tab = self.tab_widget.widget(index)
+        if tab.is_sorting:
+            QMessageBox.warning(self, "Import", "Disable sort before importing.")
+            return
+        try:
+            rows, problems, examples = check_import_file(path, tab.schema)
+            if problems:
+                reply = QMessageBox.question(
+                    self, "Import", f"{problems} of {rows} rows have problems:\n" + "\n".join(examples) +
+                    "\n\nRows without a name are skipped and bad dates are imported as 'Invalid Date'. Continue?",
+                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+                if reply != QMessageBox.Yes:
+                    return
+            added = tab.import_entries(path)
+        except (OSError, ValueError, csv.Error) as e:
+            QMessageBox.critical(self, "Import", f"Failed to import {os.path.basename(path)}\n{e}")
+            return
+        QMessageBox.information(self, "Import", f"Imported {added} entries.")
+
+    def export_tab(self, index):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Entries", self.tab_widget.tabText(index) + ".csv",
+                                              IMPORT_EXPORT_FILTER)
+        if not path:
+            return
+        self.open_tab(index)
+        try:
+            exported = self.tab_widget.widget(index).export_entries(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Export", f"Failed to export {os.path.basename(path)}\n{e}")
+            return
+        QMessageBox.information(self, "Export", f"Exported {exported} entries.")
+
+    def choose_tab_sound(self, index):
+        tab = self.tab_widget.widget(index)
+        path, _ = QFileDialog.getOpenFileName(self, "Alarm Sound", tab.alarms.sound or "", SOUND_FILE_FILTER)
+        if not path:
+            if tab.alarms.sound and QMessageBox.question(
+                    self, "Alarm Sound", "Go back to the default alarm sound?",
+                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No) == QMessageBox.Yes:
+                tab.alarms.sound = None
+                self.save_tabs()
+            return
+        audio = get_audio_engine()
+        audio.preload([path])
+        if audio.ready and path not in audio.sounds:
+            QMessageBox.warning(self, "Alarm Sound", f"Could not load {os.path.basename(path)}")
+            return
+        tab.alarms.sound = path
+        self.save_tabs()
+
+    def preload_sounds(self):
+        # Decode every tab's alarm sound once the window is up, not when the first alarm rings
+        sounds = {ALARM_SOUND}
+        for index in range(self.tab_widget.count()):
+            sound = self.tab_widget.widget(index).alarms.sound
+            if sound:
+                sounds.add(sound)
+        get_audio_engine().preload(sorted(sounds))
+
     # --------------------- Data ------------------------
     def save_all_tabs_data(self):
         for index in range(self.tab_widget.count()):
             tab = self.tab_widget.widget(index)
             if isinstance(tab, ScheduleApp):
                 tab.save_data()
+        # Forced flush: write everything now and wait for the writer thread
+        self.save_scheduler.flush(wait=True)
 
     def closeEvent(self, event):
         self.save_all_tabs_data()
+        for index in range(self.tab_widget.count()):
+            self.stop_tab_search(self.tab_widget.widget(index))
+        if shared_download_manager is not None:
+            shared_download_manager.shutdown()
+        close_http_client()
         event.accept()
 
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange and not self.isMinimized():
+            current_widget = self.tab_widget.currentWidget()
+            if isinstance(current_widget, ScheduleApp):
+                current_widget.update_countdown()  # ticks were skipped while minimized
+
     def minimize_to_tray(self):
         self.hide()
         self.tray_icon.show()
@@ -1347,10 +2099,33 @@ class MainApp(QMainWindow):
             self.tray_icon.hide()
             self.showNormal()
 
-    def add_new_tab(self, tab_name, filename):
-        new_tab = ScheduleApp(filename)
+    def add_new_tab(self, tab_name, filename, lazy=False, schema=None, sound=None):
+        schema = schema or TabSchema.for_filename(filename)
+        if lazy:
+            new_tab = TabPlaceholder(filename, self.storage, schema, sound)  # built on first activation
+        else:
+            new_tab = ScheduleApp(filename, self.save_scheduler, self.storage, clock=self.clock, schema=schema)
         self.tab_widget.addTab(new_tab, tab_name)
-        self.save_tabs()
+        self.name_index.queue_store(filename, new_tab.store)
+        self.index_timer.start()
+        if not self.loading_tabs:
+            self.save_tabs()  # load_tabs saves once when every saved tab is back
+
+    def open_tab(self, index):
+        # Replace a placeholder with the real tab, reusing its loaded entries and alarm tracker
+        placeholder = self.tab_widget.widget(index)
+        if not isinstance(placeholder, TabPlaceholder):
+            return
+        tab = ScheduleApp(placeholder.filename, self.save_scheduler, self.storage, placeholder.store,
+                          placeholder.alarms, self.clock, placeholder.schema)
+        is_current = self.tab_widget.currentIndex() == index
+        self.tab_widget.blockSignals(True)
+        self.tab_widget.insertTab(index, tab, self.tab_widget.tabText(index))
+        self.tab_widget.removeTab(index + 1)
+        if is_current:
+            self.tab_widget.setCurrentIndex(index)
+        self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
 
     def create_new_tab(self):
         tab_name, ok = QInputDialog.getText(self, 'Input Dialog', 'Enter tab name:')
@@ -1358,48 +2133,76 @@ class MainApp(QMainWindow):
             first_word = tab_name.split()[0]
             current_time = datetime.now().strftime("%Y-%m-%d_%H%M%S")
             filename = os.path.join("Data", f"{first_word}_{current_time}.json")
-            self.add_new_tab(tab_name, filename)
+            # The tab type is chosen here and saved with the tab; the name only suggests a default
+            kinds = ["watch", "plain"]
+            labels = ["Episodes (+1 Week)", "Plain schedule"]
+            default = kinds.index(TabSchema.for_filename(filename).kind)
+            label, ok = QInputDialog.getItem(self, 'Input Dialog', 'Tab type:', labels, default, False)
+            if ok:
+                self.add_new_tab(tab_name, filename, schema=TabSchema(kinds[labels.index(label)]))
 
     def save_tabs(self):
+        if not self.tabs_loaded:
+            return  # the saved tabs haven't been read yet; don't overwrite them
         tabs_info = []
         for index in range(self.tab_widget.count()):
             widget = self.tab_widget.widget(index)
             tab_name = self.tab_widget.tabText(index)
             filename = widget.filename
-            tabs_info.append({"name": tab_name, "filename": filename})
+            tabs_info.append({"name": tab_name, "filename": filename, "schema": widget.schema.to_dict(),
+                              "sound": widget.alarms.sound})
 
         current_tab_index = self.tab_widget.currentIndex()
 
-        with open(CONFIG_FILE, "w") as file:
-            json.dump({"tabs_info": tabs_info, "current_tab_index": current_tab_index}, file)
+        self.storage.save_tabs(tabs_info, current_tab_index)
 
     def load_tabs(self):
         # print("Loading tabs")  # Debug log
-        try:
-            with open(CONFIG_FILE, "r") as file:
-                data = json.load(file)
-                if isinstance(data, dict) and "tabs_info" in data:
-                    tabs_info = data["tabs_info"]
-                    for tab_info in tabs_info:
-                        # print(f"Adding tab: {tab_info['name']}, filename: {tab_info['filename']}")  # Debug log
-                        self.add_new_tab(tab_info["name"], tab_info["filename"])
-                    current_tab_index = data.get("current_tab_index", 0)
-                    self.tab_widget.setCurrentIndex(current_tab_index)
-                elif isinstance(data, list):
-                    for tab_info in data:
-                        # print(f"Adding tab: {tab_info['name']}, filename: {tab_info['filename']}")  # Debug log
-                        self.add_new_tab(tab_info["name"], tab_info["filename"])
-                    self.tab_widget.setCurrentIndex(0)
-        except FileNotFoundError:
+        data = self.storage.load_tabs()
+        startup_report.mark("config read")
+        # Tabs start as placeholders; only the current one is built now, the rest when first opened
+        self.loading_tabs = True
+        if isinstance(data, dict) and "tabs_info" in data:
+            tabs_info = data["tabs_info"]
+            for tab_info in tabs_info:
+                # print(f"Adding tab: {tab_info['name']}, filename: {tab_info['filename']}")  # Debug log
+                schema = TabSchema.from_dict(tab_info.get("schema"), tab_info["filename"])
+                sound = tab_info.get("sound")
+                if sound is None and isinstance(tab_info.get("schema"), dict):
+                    sound = tab_info["schema"].get("sound")  # saved inside the schema by earlier versions
+                self.add_new_tab(tab_info["name"], tab_info["filename"], lazy=True, schema=schema, sound=sound)
+                startup_report.mark(f"load tab {tab_info['name']}")
+            current_tab_index = data.get("current_tab_index", 0)
+            self.tab_widget.setCurrentIndex(current_tab_index)
+        elif isinstance(data, list):
+            for tab_info in data:
+                # print(f"Adding tab: {tab_info['name']}, filename: {tab_info['filename']}")  # Debug log
+                self.add_new_tab(tab_info["name"], tab_info["filename"], lazy=True)
+                startup_report.mark(f"load tab {tab_info['name']}")
+            self.tab_widget.setCurrentIndex(0)
+        self.loading_tabs = False
+        if self.tab_widget.count():
+            self.save_tabs()  # once, with the full tab list (schemas of older configs are written back here)
+            self.open_tab(self.tab_widget.currentIndex())
+            startup_report.mark("open current tab")
+        else:
             # print("Config file not found, creating default tab")  # Debug log
             tab1_filename = os.path.join("Data", f"ScheduleApp_tab1.json")
             self.add_new_tab("Anime", tab1_filename)
         # print("Tab loading complete")  # Debug log
 
+    def stop_tab_search(self, widget):
+        # Drop the tab's queued Nyaa search and let its worker pool wind down
+        if isinstance(widget, ScheduleApp) and widget.nyaa_search is not None:
+            widget.nyaa_search.shutdown()
+
     def on_tab_changed(self, index):
         # print(f"Changing to tab {index}")  # Debug log
+        if not self.loading_tabs and index != -1:
+            self.open_tab(index)
         # Save tabs whenever the active tab is changed
-        self.save_tabs()
+        if not self.loading_tabs:
+            self.save_tabs()
 
     def delete_current_tab(self):
         current_index = self.tab_widget.currentIndex()
@@ -1413,12 +2216,80 @@ class MainApp(QMainWindow):
                 current_widget = self.tab_widget.widget(current_index)
                 # Remove the tab from the QTabWidget
                 self.tab_widget.removeTab(current_index)
-                # Delete the corresponding file
-                if os.path.exists(current_widget.filename):
-                    os.remove(current_widget.filename)
+                if isinstance(current_widget, ScheduleApp):
+                    self.clock.unsubscribe(current_widget.update_countdown)
+                current_widget.alarms.stop()  # placeholders ring alarms too
+                self.stop_tab_search(current_widget)
+                self.name_index.remove_tab(current_widget.filename)
+                self.global_results.hide()
+                # Drop unsaved edits and let queued writes finish, then delete the tab's data
+                self.save_scheduler.discard(current_widget)
+                self.save_scheduler.flush(wait=True)
+                current_widget.store.delete_files()
+                current_widget.deleteLater()
                 # Update the tabs_config.json file
                 self.save_tabs()
 
+    # --------------------- Global search ------------------------
+    def index_some_entries(self):
+        # Placeholders already hold their entries, so unopened tabs are indexed too; once queued, the
+        # stores keep the index current themselves
+        if self.name_index.index_some():
+            return
+        self.index_timer.stop()
+        # print(f"Name index built: {self.name_index.stats()}")  # Debug log
+        if self.global_results.isVisible() and self.search_box.text().strip():
+            self.run_global_search()  # the last search only saw part of the tabs
+
+    def on_search_text_changed(self, text):
+        if text.strip():
+            self.search_timer.start()  # restarts while typing
+        else:
+            self.search_timer.stop()
+            self.global_results.clear()
+            self.global_results.hide()
+
+    def run_global_search(self):
+        query = self.search_box.text()
+        tab_names = {self.tab_widget.widget(index).filename: self.tab_widget.tabText(index)
+                     for index in range(self.tab_widget.count())}
+        self.global_results.clear()
+        for filename, key, name in self.name_index.search(query):
+            item = QListWidgetItem(f"{name}   ({tab_names.get(filename, '?')})")
+            item.setData(Qt.UserRole, (filename, key))
+            self.global_results.addItem(item)
+        if self.name_index.building():
+            item = QListWidgetItem("Still indexing some tabs...")
+            item.setFlags(Qt.NoItemFlags)
+            self.global_results.addItem(item)
+        elif not self.global_results.count():
+            item = QListWidgetItem("No matches.")
+            item.setFlags(Qt.NoItemFlags)
+            self.global_results.addItem(item)
+        self.global_results.show()
+
+    def jump_to_first_result(self):
+        if self.search_timer.isActive():
+            self.search_timer.stop()
+            self.run_global_search()
+        item = self.global_results.item(0)
+        if item is not None and item.data(Qt.UserRole):
+            self.jump_to_result(item)
+
+    def jump_to_result(self, item):
+        target = item.data(Qt.UserRole)
+        if not target:
+            return
+        filename, key = target
+        for index in range(self.tab_widget.count()):
+            if self.tab_widget.widget(index).filename == filename:
+                self.open_tab(index)
+                self.tab_widget.setCurrentIndex(index)
+                tab = self.tab_widget.widget(index)
+                if tab.reveal_entry(key):
+                    self.global_results.hide()
+                return
+
 
     # -------------- styling ----------------
     def set_tab_style(self):
@@ -1574,7 +2445,9 @@ class ResizableFrame(QWidget):
 
 
 if __name__ == "__main__":
+    startup_report.mark("imports")
     app = QApplication(sys.argv)
+    startup_report.mark("QApplication")
     main_window = MainApp()
     main_window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,66 @@
+# EntryStore journal: edits are appended as change records and folded into the snapshot on compaction.
+import json
+
+from core import EntryStore
+
+
+def make_entry(name, date_time="N/A", **fields):
+    entry = {"name": name, "datetime": date_time, "status": False, "alarm": False, "snooze": False}
+    entry.update(fields)
+    return entry
+
+
+def names(store):
+    return [store.entries[key]["name"] for key in store.order]
+
+
+def test_journal_replays_edits_on_top_of_the_snapshot(tmp_path):
+    filename = str(tmp_path / "tab.json")
+    store = EntryStore(filename)
+    for name in "abcde":
+        store.insert(make_entry(name))
+    store.compact()  # snapshot a..e, empty journal
+    store.set_field(store.order[0], "name", "A")
+    store.move(0, 4)
+    store.move_rows([0, 1], 3)
+    store.delete_rows([1])
+    store.insert(make_entry("f"))
+    store.save()
+    assert not store.pending
+    assert json.load(open(filename))["0"]["name"] == "a"  # edits only went to the journal
+
+    reopened = EntryStore(filename)
+    assert names(reopened) == names(store)
+    assert [reopened.entries[key]["entry_position"] for key in reopened.order] == list(range(len(reopened)))
+    assert reopened.new_key() == store.new_key()
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    filename = str(tmp_path / "tab.json")
+    store = EntryStore(filename)
+    store.insert(make_entry("a"))
+    store.insert(make_entry("b"))
+    store.save()
+    store.compact()
+    assert not (tmp_path / "tab.json.journal").exists()
+    assert not (tmp_path / ("tab.json" + EntryStore.COMPACTING_SUFFIX)).exists()
+    assert names(EntryStore(filename)) == ["a", "b"]
+
+
+def test_interrupted_compaction_is_replayed_and_finished(tmp_path):
+    filename = str(tmp_path / "tab.json")
+    store = EntryStore(filename)
+    store.insert(make_entry("a"))
+    store.compact()
+    store.insert(make_entry("b"))
+    store.save()
+    # the app stopped after rotating the journal, before the snapshot was written
+    (tmp_path / "tab.json.journal").rename(tmp_path / ("tab.json" + EntryStore.COMPACTING_SUFFIX))
+    with open(tmp_path / "tab.json.journal", "a") as file:
+        file.write(json.dumps({"op": "set", "key": "1", "field": "name", "value": "B"}) + "\n")
+        file.write('{"op": "ins')  # torn last line
+
+    reopened = EntryStore(filename)
+    assert names(reopened) == ["a", "B"]
+    assert not (tmp_path / ("tab.json" + EntryStore.COMPACTING_SUFFIX)).exists()
+    assert names(EntryStore(filename)) == ["a", "B"]
@@ -0,0 +1,61 @@
+# NameIndex: word, prefix and one-typo matches, kept current by the stores it watches.
+from core import EntryStore, NameIndex
+
+
+def make_entry(name, date_time="N/A", **fields):
+    entry = {"name": name, "datetime": date_time, "status": False, "alarm": False, "snooze": False}
+    entry.update(fields)
+    return entry
+
+
+def test_name_index_follows_store_changes(tmp_path):
+    store = EntryStore(str(tmp_path / "tab.json"))
+    store.insert(make_entry("Frieren: Beyond Journey's End"))
+    index = NameIndex()
+    index.add_store("tab", store)
+    assert [name for _, _, name in index.search("frie")] == ["Frieren: Beyond Journey's End"]
+    assert index.search("freiren")  # one swap away
+    assert index.search("journey frie")
+
+    key = store.insert(make_entry("Dungeon Meshi"))
+    assert index.search("meshi") == [("tab", key, "Dungeon Meshi")]
+    store.set_field(key, "name", "Spy x Family")
+    assert index.search("meshi") == []
+    assert index.search("famly") == [("tab", key, "Spy x Family")]
+    store.delete_rows([0, 1])
+    assert index.search("spy") == [] and len(index) == 0
+
+    index.remove_tab("tab")
+    assert store.watchers == [] and index.words == [] and index.deletions == {}
+
+
+def test_name_index_ranks_exact_before_prefix_before_typo():
+    index = NameIndex()
+    index.add("a", "1", "Blue Lockdown")
+    index.add("a", "2", "Blue Lock")
+    index.add("b", "3", "Blue Lick")
+    assert [key for _, key, _ in index.search("lock")] == ["2", "1", "3"]
+    assert index.search("") == []
+
+
+def test_queued_store_is_indexed_in_slices_and_keeps_edits_made_meanwhile(tmp_path):
+    store = EntryStore(str(tmp_path / "tab.json"))
+    keys = [store.insert(make_entry(f"Blue Lock {number}")) for number in range(10)]
+    index = NameIndex()
+    index.queue_store("tab", store)
+    assert index.building() and index.search("blue") == []
+
+    assert index.index_some(4)  # more to come
+    assert len(index.search("blue")) == 4
+    store.set_field(keys[8], "name", "Oshi no Ko")  # not indexed yet: the watcher indexes the new name
+    store.delete_rows([9])
+    new_key = store.insert(make_entry("Blue Period"))
+    while index.index_some(4):
+        pass
+    assert not index.building()
+    assert {key for _, key, _ in index.search("blue")} == set(keys[:8]) | {new_key}
+    assert index.search("oshi") == [("tab", keys[8], "Oshi no Ko")]
+
+    index.queue_store("other", store)
+    index.remove_tab("other")  # dropped from the queue as well
+    assert not index.building()
@@ -0,0 +1,99 @@
+# NyaaClient against a local http.server standing in for nyaa.si. Skipped when requests isn't installed.
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core import RssCache
+
+FEED_ITEMS = [(f"item{number}", number * 7 % 31) for number in range(40)]  # (title, seeders)
+
+
+def rss_feed(items):
+    body = "".join(f"<item><title>{title}</title><link>https://example.test/{title}.torrent</link>"
+                   f"<nyaa:seeders>{seeders}</nyaa:seeders><nyaa:size>1 GiB</nyaa:size></item>"
+                   for title, seeders in items)
+    return (f'<?xml version="1.0"?><rss xmlns:nyaa="https://nyaa.si/xmlns/nyaa"><channel>{body}</channel></rss>'
+            ).encode()
+
+
+@pytest.fixture
+def nyaa_server():
+    # Answers any RSS query with the same feed and records the paths it was asked for
+    pytest.importorskip("requests")
+    feed = rss_feed(FEED_ITEMS)
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(feed)))
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            self.wfile.write(feed)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http():
+    from core import HttpClient
+    client = HttpClient(retries=0)
+    yield client
+    client.close()
+
+
+def test_repeated_query_is_served_from_the_cache_then_revalidated(tmp_path, nyaa_server, http):
+    from core import NyaaClient
+    base_url, requests_seen = nyaa_server
+    client = NyaaClient(base_url, timeout=5, cache=RssCache(str(tmp_path / "rss"), ttl=600), http=http, limit=10)
+    results = client.search("Frieren 1080p")
+    assert "q=Frieren+1080p" in requests_seen[0]
+
+    assert client.search("  frieren   1080P ") == results  # same normalized query
+    assert len(requests_seen) == 1 and client.cache.stats()["hits"] == 1
+
+    # A new cache reads the saved index; once the entry has expired the server is asked again and says 304
+    stale = NyaaClient(base_url, timeout=5, cache=RssCache(str(tmp_path / "rss")), http=http, limit=10)
+    for meta in stale.cache.index.values():
+        meta["expires"] = 0
+    assert stale.search("Frieren 1080p") == results
+    assert len(requests_seen) == 2 and stale.cache.stats()["revalidated"] == 1
+
+
+def test_search_streams_batches_of_the_best_seeded_items(tmp_path, nyaa_server, http):
+    from core import NyaaClient
+    base_url, _ = nyaa_server
+    client = NyaaClient(base_url, timeout=5, cache=RssCache(str(tmp_path / "rss")), http=http, limit=10)
+    batches = []
+    results = client.search("Frieren 1080p", batches.append)
+    expected = sorted(FEED_ITEMS, key=lambda item: item[1], reverse=True)[:10]
+    assert [(title, seeders) for title, _, seeders, _ in results] == expected
+    assert {item for batch in batches for item in batch} >= set(results)
+    assert client.search("other", wanted=lambda: False) is None  # abandoned searches stop early
+
+
+def test_malformed_items_are_skipped():
+    from core import iter_nyaa_items
+    feed = rss_feed([("good", 5)]).replace(b"</channel>", (
+        b"<item><title>empty seeders</title><link>x</link><nyaa:seeders></nyaa:seeders><nyaa:size>1</nyaa:size></item>"
+        b"<item><title>no size</title><link>x</link><nyaa:seeders>3</nyaa:seeders></item>"
+        b"<item><link>x</link><nyaa:seeders>3</nyaa:seeders><nyaa:size>1</nyaa:size></item>"
+        b"<item><title>words</title><link>x</link><nyaa:seeders>n/a</nyaa:seeders><nyaa:size>1</nyaa:size></item>"
+        b"</channel>"))
+    chunks = [feed[start:start + 37] for start in range(0, len(feed), 37)]
+    assert [item[0] for item in iter_nyaa_items(chunks)] == ["good"]
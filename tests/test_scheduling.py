@@ -0,0 +1,23 @@
+# DeadlineHeap: the alarm queue behind AlarmScheduler.
+from datetime import datetime, timedelta
+
+from core import DeadlineHeap
+
+
+def test_bulk_schedule_matches_one_at_a_time():
+    start = datetime(2026, 10, 20, 9, 0)
+    deadlines = [(start + timedelta(minutes=(number * 37) % 101), str(number)) for number in range(200)]
+    one_by_one, bulk = DeadlineHeap(), DeadlineHeap()
+    for deadline, key in deadlines:
+        one_by_one.schedule(key, deadline)
+    bulk.schedule_all(deadlines)
+    assert bulk.peek() == one_by_one.peek() and len(bulk) == 200
+
+    bulk.schedule("0", start - timedelta(days=1))  # rescheduled: the old item is skipped
+    bulk.discard("1")
+    due = bulk.pop_due(start + timedelta(minutes=50))
+    assert due[0] == "0" and "1" not in due
+    assert all(deadline > start + timedelta(minutes=50) for deadline in bulk.deadlines.values())
+
+    bulk.clear()
+    assert bulk.peek() is None and len(bulk) == 0
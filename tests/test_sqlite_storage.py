@@ -0,0 +1,74 @@
+# SqliteStorage: change records applied as single-row statements, and the saved tab list.
+import os
+import json
+from datetime import datetime, timedelta
+
+from core import CONFIG_FILE, EntryStore, SqliteStorage, TabSchema, format_date_time
+
+
+def make_entry(name, date_time="N/A", **fields):
+    entry = {"name": name, "datetime": date_time, "status": False, "alarm": False, "snooze": False}
+    entry.update(fields)
+    return entry
+
+
+def names(store):
+    return [store.entries[key]["name"] for key in store.order]
+
+
+def test_sqlite_records_keep_positions_in_step(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # nothing to migrate from Data/tabs_config.json
+    storage = SqliteStorage(str(tmp_path / "schedule.db"))
+    store = storage.open_store("tab.json")
+    for position in range(10):
+        store.insert(make_entry(f"entry {position}", format_date_time(datetime(2026, 1, 1) + timedelta(days=position)),
+                                note=f"n{position}"))
+    store.save()
+    store.move(9, 0)
+    store.move(2, 6)
+    store.move_rows([1, 3, 4], 8)
+    store.move_rows([7, 8], 0)
+    store.delete_rows([0, 5, 6])
+    store.delete(2)
+    store.set_field(store.order[0], "note", "changed")
+    store.set_field(store.order[1], "datetime", "N/A")
+    store.save()
+
+    reopened = SqliteStorage(str(tmp_path / "schedule.db")).open_store("tab.json")
+    assert names(reopened) == names(store)
+    assert [reopened.entries[key]["entry_position"] for key in reopened.order] == list(range(len(store)))
+    for key in store.order:
+        assert reopened.entries[key] == store.entries[key]
+
+
+def test_sqlite_tabs_keep_schema_and_sound(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = SqliteStorage(str(tmp_path / "schedule.db"))
+    tabs = [{"name": "Anime", "filename": "a.json", "schema": TabSchema("watch", ["studio"]).to_dict(),
+             "sound": "bell.ogg"},
+            {"name": "Plain", "filename": "b.json", "schema": None, "sound": None}]
+    storage.save_tabs(tabs, 1)
+    assert storage.load_tabs() == {"tabs_info": tabs, "current_tab_index": 1}
+
+
+def test_json_tabs_are_migrated_without_touching_the_json_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Data").mkdir()
+    filename = str(tmp_path / "Data" / "tab.json")
+    store = EntryStore(filename)
+    store.insert(make_entry("a"))
+    store.compact()
+    store.insert(make_entry("b"))
+    store.save()
+    # stopped mid-compaction: a journal and a rotated journal next to the snapshot
+    journal, compacting = filename + EntryStore.JOURNAL_SUFFIX, filename + EntryStore.COMPACTING_SUFFIX
+    os.replace(journal, compacting)
+    with open(journal, "w") as file:
+        file.write(json.dumps({"op": "set", "key": "1", "field": "name", "value": "B"}) + "\n")
+    with open(CONFIG_FILE, "w") as file:
+        json.dump({"tabs_info": [{"name": "Tab", "filename": filename}], "current_tab_index": 0}, file)
+    before = {path: open(path, "rb").read() for path in (filename, journal, compacting)}
+
+    storage = SqliteStorage(str(tmp_path / "Data" / "schedule.db"))
+    assert names(storage.open_store(filename)) == ["a", "B"]
+    assert {path: open(path, "rb").read() for path in before} == before
@@ -0,0 +1,39 @@
+# Import/export: files written by export_entries read back to the same entries.
+from datetime import datetime
+
+import pytest
+
+from core import EntryStore, TabSchema, export_entries, format_date_time, iter_import_entries
+
+
+def make_entry(name, date_time="N/A", **fields):
+    entry = {"name": name, "datetime": date_time, "status": False, "alarm": False, "snooze": False}
+    entry.update(fields)
+    return entry
+
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl", ".ics"])
+def test_export_then_import_round_trip(tmp_path, extension):
+    schema = TabSchema("watch", ["my col", "a;b:c"])
+    store = EntryStore(str(tmp_path / "tab.json"))
+    store.insert(make_entry("Frieren, part 2; \"finale\"", format_date_time(datetime(2026, 10, 20, 21, 30)),
+                            alarm=True, snooze=True, episode="S02 E-10", **{"my col": "x", "a;b:c": "y,z"}))
+    store.insert(make_entry("Dungeon Meshi", format_date_time(datetime(2026, 11, 1)), status=True,
+                            episode="S01 E-24", **{"my col": "", "a;b:c": "multi\nline"}))
+    path = str(tmp_path / ("export" + extension))
+    assert export_entries(path, store, schema) == 2
+
+    imported = list(iter_import_entries(path, schema))
+    for entry, original in zip(imported, store.rows()):
+        for column in ("name", "datetime", "status", "alarm", "snooze", "episode", "my col", "a;b:c"):
+            assert entry[column] == original[column], column
+    assert len(imported) == 2
+
+
+def test_undated_entries_are_left_out_of_ics(tmp_path):
+    schema = TabSchema("plain")
+    store = EntryStore(str(tmp_path / "tab.json"))
+    store.insert(make_entry("dated", format_date_time(datetime(2026, 10, 20, 9, 0))))
+    store.insert(make_entry("undated"))
+    assert export_entries(str(tmp_path / "out.ics"), store, schema) == 1
+    assert export_entries(str(tmp_path / "out.csv"), store, schema) == 2